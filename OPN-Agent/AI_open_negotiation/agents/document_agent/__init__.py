@@ -3,15 +3,18 @@ Agents module for the Document Agent System.
 Contains all agent implementations for document processing.
 """
 
-from .base_agent import BaseAgent
+from .base_agent import AgentExecutor, BaseAgent
 from .validation_agent import ValidationAgent
 from .generation_agents import GroupGenerationAgent, NoticeGenerationAgent
+from .grouped_input import GroupedInput
 from .orchestrator_agent import OrchestratorAgent
 
 __all__ = [
+    "AgentExecutor",
     "BaseAgent",
     "ValidationAgent",
     "GroupGenerationAgent",
     "NoticeGenerationAgent",
+    "GroupedInput",
     "OrchestratorAgent",
 ]
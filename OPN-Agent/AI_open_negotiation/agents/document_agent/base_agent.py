@@ -1,24 +1,72 @@
 """
 Base Agent for the Document Agent System.
 
-Provides an abstract base class for all agents with common functionality
+Provides a base class for all agents with common functionality
 including logging, configuration, retry logic, and error handling.
 """
 
 import asyncio
+import atexit
 import logging
-from abc import ABC, abstractmethod
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any, Callable, Dict, Optional, TypeVar
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Protocol, Tuple, TypeVar, Union
 
 from AI_open_negotiation.models.task_models import DocumentTask, TaskStatus
 
 
 T = TypeVar("T")
 
+# Logging invariants shared by every agent; built once at import time
+_LEVEL_MAP: Dict[str, int] = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+_SHARED_FORMATTER = logging.Formatter(
+    "%(asctime)s [%(name)s] [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S"
+)
+_LOG_QUEUE_MAXSIZE = 10000
 
-@dataclass
+
+class _DropOldestQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that discards the oldest record instead of blocking when full."""
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                pass
+
+
+# Agents only enqueue records; the stream write happens on the listener thread
+# so logging never blocks the event loop.
+_LOG_QUEUE: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=_LOG_QUEUE_MAXSIZE)
+_STREAM_HANDLER = logging.StreamHandler(sys.stderr)
+_STREAM_HANDLER.setFormatter(_SHARED_FORMATTER)
+_SHARED_HANDLER = _DropOldestQueueHandler(_LOG_QUEUE)
+_LOG_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, _STREAM_HANDLER)
+_LOG_LISTENER.start()
+atexit.register(_LOG_LISTENER.stop)
+
+
+@dataclass(frozen=True, slots=True)
 class AgentConfig:
     """
     Configuration for agent behavior.
@@ -27,22 +75,79 @@ class AgentConfig:
         max_retries: Maximum retry attempts for failed operations
         retry_delay_seconds: Initial delay between retries
         retry_backoff_multiplier: Multiplier for exponential backoff
+        retry_delay_cap_seconds: Upper bound on any single retry delay
         timeout_seconds: Maximum time for operation completion
         enable_parallel_processing: Whether to enable parallel processing
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR)
+        verbose_retry_logging: Log a warning on every retry instead of only the first
+        custom_settings: Agent-specific options, stored as a read-only copy
     """
     max_retries: int = 3
     retry_delay_seconds: float = 1.0
     retry_backoff_multiplier: float = 2.0
+    retry_delay_cap_seconds: float = 60.0
     timeout_seconds: int = 300
     enable_parallel_processing: bool = True
     log_level: str = "INFO"
-    custom_settings: Dict[str, Any] = field(default_factory=dict)
+    verbose_retry_logging: bool = False
+    custom_settings: Mapping[str, Any] = field(default_factory=dict)
+    
+    def __post_init__(self) -> None:
+        # Copy and freeze so a config can never be changed through a shared
+        # reference, including the cached instances from _parse_config.
+        object.__setattr__(
+            self, "custom_settings", MappingProxyType(dict(self.custom_settings))
+        )
+
 
+# Agent loggers keyed by agent name; the lock is only taken on a miss
+_LOGGER_CACHE: Dict[str, logging.Logger] = {}
+_LOGGER_CACHE_LOCK = threading.Lock()
 
-class BaseAgent(ABC):
+# Parsed configs keyed by their scalar settings; safe to share because
+# AgentConfig is frozen.
+_CONFIG_CACHE: Dict[Tuple[Any, ...], AgentConfig] = {}
+
+
+def get_agent_logger(name: str, log_level: str = "INFO") -> logging.Logger:
     """
-    Abstract base class for all document processing agents.
+    Get the ``Agent.<name>`` logger, attached to the shared queued handler.
+    
+    Records are written by a background listener thread, so logging calls
+    never block on console I/O.
+    
+    Args:
+        name: Agent or component name
+        log_level: Logging level name (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        
+    Returns:
+        Configured logger instance
+    """
+    logger = _LOGGER_CACHE.get(name)
+    if logger is None:
+        with _LOGGER_CACHE_LOCK:
+            logger = _LOGGER_CACHE.get(name)
+            if logger is None:
+                logger = logging.getLogger("Agent." + name)
+                _LOGGER_CACHE[name] = logger
+    logger.setLevel(_LEVEL_MAP.get(log_level.upper(), logging.INFO))
+    
+    # Add handler if not already present
+    if not logger.handlers:
+        logger.addHandler(_SHARED_HANDLER)
+    
+    return logger
+
+
+class AgentExecutor(Protocol):
+    """Structural type for anything that can execute a DocumentTask."""
+    
+    async def execute(self, task: DocumentTask) -> DocumentTask: ...
+
+
+class BaseAgent:
+    """
+    Base class for all document processing agents.
     
     Provides common functionality including:
     - Structured logging with agent name prefix
@@ -51,7 +156,8 @@ class BaseAgent(ABC):
     - Error handling and reporting
     - Async execution support
     
-    Subclasses must implement the `execute` method.
+    Subclasses must implement the `execute` method; this is enforced when
+    the subclass is defined rather than through an ABCMeta metaclass.
     
     Example:
         >>> class MyAgent(BaseAgent):
@@ -61,6 +167,12 @@ class BaseAgent(ABC):
         ...         return task
     """
     
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Reject subclasses that do not override execute()."""
+        super().__init_subclass__(**kwargs)
+        if cls.execute is BaseAgent.execute:
+            raise TypeError(f"{cls.__name__} must implement execute()")
+    
     def __init__(self, name: str, config: Optional[Dict[str, Any]] = None):
         """
         Initialize the agent with name and configuration.
@@ -69,22 +181,45 @@ class BaseAgent(ABC):
             name: Human-readable name for the agent
             config: Configuration dictionary (converted to AgentConfig)
         """
-        self.name = name
+        if type(self) is BaseAgent:
+            raise TypeError("BaseAgent cannot be instantiated directly")
+        self.name = sys.intern(name)
         self.config = self._parse_config(config or {})
+        self._delay_schedule = self._build_delay_schedule()
         self.logger = self._setup_logger()
-        self._start_time: Optional[datetime] = None
+        # Bound once so hot paths skip the self.logger.<method> lookups
+        self._log_info = self.logger.info
+        self._log_warn = self.logger.warning
+        self._log_err = self.logger.error
+        self._log_dbg = self.logger.debug
+        self._start_time: Optional[float] = None
     
     def _parse_config(self, config: Dict[str, Any]) -> AgentConfig:
-        """Parse dictionary config into AgentConfig dataclass."""
-        return AgentConfig(
-            max_retries=config.get("max_retries", 3),
-            retry_delay_seconds=config.get("retry_delay_seconds", 1.0),
-            retry_backoff_multiplier=config.get("retry_backoff_multiplier", 2.0),
-            timeout_seconds=config.get("timeout_seconds", 300),
-            enable_parallel_processing=config.get("enable_parallel_processing", True),
-            log_level=config.get("log_level", "INFO"),
-            custom_settings=config.get("custom_settings", {}),
-        )
+        """
+        Parse dictionary config into AgentConfig dataclass.
+        
+        Configs without custom_settings are cached by value and shared
+        between agents; configs that pass custom_settings (even an empty
+        one) get a private instance. custom_settings is read-only either way.
+        """
+        settings = {
+            "max_retries": config.get("max_retries", 3),
+            "retry_delay_seconds": config.get("retry_delay_seconds", 1.0),
+            "retry_backoff_multiplier": config.get("retry_backoff_multiplier", 2.0),
+            "retry_delay_cap_seconds": config.get("retry_delay_cap_seconds", 60.0),
+            "timeout_seconds": config.get("timeout_seconds", 300),
+            "enable_parallel_processing": config.get("enable_parallel_processing", True),
+            "log_level": config.get("log_level", "INFO"),
+            "verbose_retry_logging": config.get("verbose_retry_logging", False),
+        }
+        if "custom_settings" in config:
+            return AgentConfig(**settings, custom_settings=config["custom_settings"] or {})
+        
+        key = tuple(settings.values())
+        cached = _CONFIG_CACHE.get(key)
+        if cached is None:
+            cached = _CONFIG_CACHE[key] = AgentConfig(**settings)
+        return cached
     
     def _setup_logger(self) -> logging.Logger:
         """
@@ -93,22 +228,8 @@ class BaseAgent(ABC):
         Returns:
             Configured logger instance with agent name prefix.
         """
-        logger = logging.getLogger(f"Agent.{self.name}")
-        logger.setLevel(getattr(logging, self.config.log_level.upper(), logging.INFO))
-        
-        # Add handler if not already present
-        if not logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter(
-                f"%(asctime)s [{self.name}] [%(levelname)s] %(message)s",
-                datefmt="%Y-%m-%d %H:%M:%S"
-            )
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
-        
-        return logger
+        return get_agent_logger(self.name, self.config.log_level)
     
-    @abstractmethod
     async def execute(self, task: DocumentTask) -> DocumentTask:
         """
         Execute the agent's primary task.
@@ -121,7 +242,7 @@ class BaseAgent(ABC):
         Returns:
             The processed task with updated status and metadata
         """
-        raise NotImplementedError("Subclasses must implement execute()")
+        ...
     
     async def execute_with_retry(self, task: DocumentTask) -> DocumentTask:
         """
@@ -135,45 +256,85 @@ class BaseAgent(ABC):
         Returns:
             The processed task, possibly after retries
         """
-        last_error: Optional[Exception] = None
+        last_delay = 0.0
+        verbose = self.config.verbose_retry_logging
+        # Loop invariants bound to locals for the retry hot path
+        completed = TaskStatus.COMPLETED
+        failed = TaskStatus.FAILED
+        sleep = asyncio.sleep
+        calc_delay = self._calculate_retry_delay
+        can_retry = task.can_retry()
         
-        while task.can_retry():
+        while can_retry:
             try:
-                self.logger.info(f"Executing task {task.task_id} (attempt {task.retry_count + 1})")
+                self._log_dbg(
+                    "Executing task %s (attempt %d)", task.task_id, task.retry_count + 1
+                )
                 result = await self.execute(task)
                 
-                if result.status == TaskStatus.COMPLETED:
+                if result.status is completed:
+                    if task.retry_count:
+                        self._log_info(
+                            "Task %s completed after %d retries (last delay %.1fs)",
+                            task.task_id, task.retry_count, last_delay
+                        )
                     return result
-                elif result.status == TaskStatus.FAILED and result.can_retry():
-                    task.increment_retry()
-                    delay = self._calculate_retry_delay(task.retry_count)
-                    self.logger.warning(f"Task failed, retrying in {delay:.1f}s...")
-                    await asyncio.sleep(delay)
-                else:
+                if result.status is not failed or not result.can_retry():
                     return result
+                
+                task.increment_retry()
+                can_retry = task.can_retry()
+                if not can_retry:
+                    # Terminal attempt: report now instead of sleeping first
+                    break
+                last_delay = calc_delay(task.retry_count)
+                if verbose or task.retry_count == 1:
+                    self._log_warn("Task failed, retrying in %.1fs...", last_delay)
+                await sleep(last_delay)
                     
             except Exception as e:
-                last_error = e
-                self.logger.error(f"Exception during execution: {e}")
+                self._log_err("Exception during execution: %r", e)
                 
-                if task.can_retry():
-                    task.increment_retry()
-                    delay = self._calculate_retry_delay(task.retry_count)
-                    self.logger.warning(f"Retrying in {delay:.1f}s...")
-                    await asyncio.sleep(delay)
-                else:
+                task.increment_retry()
+                can_retry = task.can_retry()
+                if not can_retry:
                     task.mark_failed(str(e))
+                    self._log_err(
+                        "Task %s failed after %d retries (last delay %.1fs)",
+                        task.task_id, task.retry_count, last_delay
+                    )
                     return task
+                last_delay = calc_delay(task.retry_count)
+                if verbose or task.retry_count == 1:
+                    self._log_warn("Retrying in %.1fs...", last_delay)
+                await sleep(last_delay)
         
-        # Max retries exceeded
-        error_msg = str(last_error) if last_error else "Max retries exceeded"
-        task.mark_failed(error_msg)
-        self.logger.error(f"Task {task.task_id} failed after {task.retry_count} retries")
+        # Only reached when the budget ran out without an exception;
+        # exceptions on the terminal attempt return from the loop above
+        task.mark_failed("Max retries exceeded")
+        self._log_err(
+            "Task %s failed after %d retries (last delay %.1fs)",
+            task.task_id, task.retry_count, last_delay
+        )
         return task
     
+    def _build_delay_schedule(self) -> Tuple[float, ...]:
+        """
+        Precompute the capped exponential backoff ceiling for every attempt.
+        
+        Returns:
+            Tuple where index ``n`` is the delay ceiling for retry ``n + 1``
+        """
+        cfg = self.config
+        return tuple(
+            min(cfg.retry_delay_cap_seconds, cfg.retry_delay_seconds * cfg.retry_backoff_multiplier ** i)
+            for i in range(max(cfg.max_retries, 1))
+        )
+    
     def _calculate_retry_delay(self, attempt: int) -> float:
         """
-        Calculate delay before next retry using exponential backoff.
+        Calculate delay before next retry using capped exponential backoff
+        with full jitter, so agents sharing an upstream don't retry in lockstep.
         
         Args:
             attempt: Current retry attempt number
@@ -181,13 +342,13 @@ class BaseAgent(ABC):
         Returns:
             Delay in seconds before next retry
         """
-        return self.config.retry_delay_seconds * (
-            self.config.retry_backoff_multiplier ** (attempt - 1)
-        )
+        schedule = self._delay_schedule
+        ceiling = schedule[min(max(attempt - 1, 0), len(schedule) - 1)]
+        return random.uniform(min(self.config.retry_delay_seconds, ceiling), ceiling)
     
     async def run_with_timeout(
         self,
-        coro: Callable[..., T],
+        coro: Union[Callable[..., Awaitable[T]], Awaitable[T]],
         *args,
         timeout: Optional[int] = None,
         **kwargs
@@ -196,39 +357,68 @@ class BaseAgent(ABC):
         Run a coroutine with timeout.
         
         Args:
-            coro: Coroutine function to execute
-            *args: Positional arguments for the coroutine
-            timeout: Timeout in seconds (uses config default if None)
-            **kwargs: Keyword arguments for the coroutine
+            coro: Coroutine function to execute, or an already-created coroutine
+            *args: Positional arguments for the coroutine function
+            timeout: Timeout in seconds (uses config default if None;
+                a non-positive config value disables the timeout)
+            **kwargs: Keyword arguments for the coroutine function
             
         Returns:
             Result of the coroutine
             
+        Raises:
+            asyncio.TimeoutError: If execution exceeds timeout
+        """
+        if not asyncio.iscoroutine(coro):
+            coro = coro(*args, **kwargs)
+        return await self.run_coro_with_timeout(coro, timeout)
+    
+    async def run_coro_with_timeout(
+        self,
+        coro: Awaitable[T],
+        timeout: Optional[int] = None
+    ) -> T:
+        """
+        Await an existing coroutine/awaitable with timeout.
+        
+        Args:
+            coro: Awaitable to run
+            timeout: Timeout in seconds (uses config default if None;
+                a non-positive config value disables the timeout)
+            
+        Returns:
+            Result of the awaitable
+            
         Raises:
             asyncio.TimeoutError: If execution exceeds timeout
         """
         timeout = timeout or self.config.timeout_seconds
-        return await asyncio.wait_for(coro(*args, **kwargs), timeout=timeout)
+        if timeout is None or timeout <= 0:
+            # Timeout disabled: await directly, no timer handle needed
+            return await coro
+        async with asyncio.timeout(timeout):
+            return await coro
     
-    def log_info(self, message: str) -> None:
-        """Log an info message."""
-        self.logger.info(message)
+    def log_info(self, message: str, *args: Any) -> None:
+        """Log an info message (``args`` are %-formatted lazily)."""
+        self._log_info(message, *args)
     
-    def log_warning(self, message: str) -> None:
-        """Log a warning message."""
-        self.logger.warning(message)
+    def log_warning(self, message: str, *args: Any) -> None:
+        """Log a warning message (``args`` are %-formatted lazily)."""
+        self._log_warn(message, *args)
     
-    def log_error(self, message: str) -> None:
-        """Log an error message."""
-        self.logger.error(message)
+    def log_error(self, message: str, *args: Any) -> None:
+        """Log an error message (``args`` are %-formatted lazily)."""
+        self._log_err(message, *args)
     
-    def log_debug(self, message: str) -> None:
-        """Log a debug message."""
-        self.logger.debug(message)
+    def log_debug(self, message: str, *args: Any) -> None:
+        """Log a debug message (``args`` are %-formatted lazily)."""
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._log_dbg(message, *args)
     
     def start_timer(self) -> None:
         """Start the execution timer."""
-        self._start_time = datetime.now()
+        self._start_time = time.monotonic()
     
     def get_elapsed_seconds(self) -> float:
         """
@@ -239,7 +429,7 @@ class BaseAgent(ABC):
         """
         if self._start_time is None:
             return 0.0
-        return (datetime.now() - self._start_time).total_seconds()
+        return time.monotonic() - self._start_time
     
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name='{self.name}')"
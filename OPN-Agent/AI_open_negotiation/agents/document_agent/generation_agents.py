@@ -6,16 +6,67 @@ Contains specialized agents for generating different document types:
 - NoticeGenerationAgent: Generates Open Negotiation Notice Word/PDF files
 """
 
+import asyncio
+import io
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import pandas as pd
 
 from AI_open_negotiation.agents.document_agent.base_agent import BaseAgent
+from AI_open_negotiation.agents.document_agent.grouped_input import GroupedInput
+from AI_open_negotiation.agents.document_agent.io_utils import (
+    convert_to_pdf_batch,
+    fill_placeholders,
+    frame_to_rows,
+    load_excel_cached,
+    load_template_bytes,
+    run_jobs,
+    write_xlsx_rows,
+)
 from AI_open_negotiation.models.task_models import DocumentTask, DocumentType, TaskStatus
 from AI_open_negotiation.models.result_models import GenerationStats
+from AI_open_negotiation.utils.formatters import format_currency_series
+
+
+def _create_dirs(paths: Set[str]) -> Dict[str, str]:
+    """
+    Create each distinct output directory once, parents before children.
+    
+    Args:
+        paths: Directories to create
+        
+    Returns:
+        Directory -> error message for any that could not be created
+    """
+    failed: Dict[str, str] = {}
+    for path in sorted(paths):
+        try:
+            os.makedirs(path, exist_ok=True)
+        except OSError as e:
+            failed[path] = str(e)
+    return failed
+
+
+def _write_group_file(job: Tuple[str, List[str], List[tuple]]) -> Optional[str]:
+    """
+    Pool worker that writes one group file.
+    
+    Args:
+        job: (output path, header, rows) for a single group
+        
+    Returns:
+        None on success, otherwise the error message
+    """
+    path, header, rows = job
+    try:
+        write_xlsx_rows(path, header, rows)
+        return None
+    except Exception as e:
+        return str(e)
 
 
 class GroupGenerationAgent(BaseAgent):
@@ -49,6 +100,12 @@ class GroupGenerationAgent(BaseAgent):
         'Offer': 'Offer for total out-of- network rate (including any cost sharing)'
     }
     
+    # Output columns rendered as currency
+    CURRENCY_COLUMNS = (
+        'Initial payment (if no initial payment amount, write N/A)',
+        'Offer for total out-of- network rate (including any cost sharing)',
+    )
+    
     def __init__(self, name: str = "GroupGenerationAgent", config: Optional[Dict[str, Any]] = None):
         """Initialize the GroupGenerationAgent."""
         super().__init__(name, config)
@@ -76,10 +133,12 @@ class GroupGenerationAgent(BaseAgent):
                 task.mark_failed("Missing excel_path or output_group_folder in input_data")
                 return task
             
-            stats = await self._generate_groups(excel_path, output_folder)
+            stats = await self._generate_groups(
+                excel_path, output_folder, input_data.get("grouped_input")
+            )
             stats.duration_seconds = self.get_elapsed_seconds()
             
-            task.metadata["stats"] = stats.to_dict()
+            task.metadata.stats = stats.to_dict()
             
             if stats.failed == 0:
                 task.mark_completed(stats.to_dict())
@@ -98,41 +157,47 @@ class GroupGenerationAgent(BaseAgent):
             task.mark_failed(str(e))
             return task
     
-    async def _generate_groups(self, excel_path: str, output_folder: str) -> GenerationStats:
+    async def _generate_groups(
+        self,
+        excel_path: str,
+        output_folder: str,
+        grouped_input: Optional[GroupedInput] = None
+    ) -> GenerationStats:
         """
         Generate group Excel files from input data.
         
         Args:
             excel_path: Path to input Excel file
             output_folder: Base folder for output files
+            grouped_input: Pre-grouped source shared with other agents;
+                built from ``excel_path`` when not provided
             
         Returns:
             GenerationStats with counts and file paths
         """
         stats = GenerationStats()
         
-        # Read and prepare data
-        df = pd.read_excel(excel_path)
-        df.columns = df.columns.str.strip()
+        # Read and prepare data (grouping is shared when the orchestrator prebuilt it)
+        if grouped_input is None:
+            grouped_input = GroupedInput.from_frame(load_excel_cached(excel_path))
+        df = grouped_input.df
         os.makedirs(output_folder, exist_ok=True)
         
-        # Get unique combinations
-        unique_combinations = df[['ProvOrgNPI', 'Provider', 'InsurancePlanName']].drop_duplicates()
-        stats.total_records = len(unique_combinations)
+        # NaN keys are kept so they are counted (and skipped) like any other combination
+        stats.total_records = len(grouped_input.group_index)
         
         self.log_info(f"Processing {stats.total_records} unique NPI/Insurance combinations")
         
-        for idx, row in unique_combinations.iterrows():
+        pending: List[Tuple[Any, Tuple[str, List[str], List[tuple]]]] = []
+        for (npi, provider, plan), positions in grouped_input.group_index.items():
             try:
-                # Filter data for this combination
-                filtered_df = df[
-                    (df['ProvOrgNPI'] == row['ProvOrgNPI']) &
-                    (df['Provider'] == row['Provider']) &
-                    (df['InsurancePlanName'] == row['InsurancePlanName'])
-                ]
+                filtered_df = df.take(positions)
                 
-                # Skip if no OpenNegGroup value
-                if filtered_df.empty or pd.isna(filtered_df.iloc[0].get('OpenNegGroup')):
+                # Skip rows with missing keys or no OpenNegGroup value
+                if (
+                    pd.isna(npi) or pd.isna(provider) or pd.isna(plan)
+                    or pd.isna(filtered_df.iloc[0].get('OpenNegGroup'))
+                ):
                     stats.add_skipped()
                     continue
                 
@@ -141,49 +206,68 @@ class GroupGenerationAgent(BaseAgent):
                     columns=self.COLUMN_MAPPING
                 )
                 
-                # Format date column
-                output_df['Date provided'] = pd.to_datetime(
-                    output_df['Date provided'], 
-                    errors='coerce'
-                ).dt.strftime('%b %d, %Y')
+                # Use the pre-formatted date column
+                output_df['Date provided'] = filtered_df['_date_fmt'].to_numpy()
                 
                 # Add serial number column
                 output_df.insert(0, 'SNO', range(1, len(output_df) + 1))
                 
                 # Format currency columns
-                output_df['Initial payment (if no initial payment amount, write N/A)'] = \
-                    output_df['Initial payment (if no initial payment amount, write N/A)'].apply(
-                        self._format_currency
-                    )
-                output_df['Offer for total out-of- network rate (including any cost sharing)'] = \
-                    output_df['Offer for total out-of- network rate (including any cost sharing)'].apply(
-                        self._format_currency
-                    )
+                for column in self.CURRENCY_COLUMNS:
+                    output_df[column] = format_currency_series(output_df[column])
                 
                 # Create output path
-                safe_npi = self._safe_filename(str(row['ProvOrgNPI']))
-                insurance = str(row['InsurancePlanName']).strip()
+                safe_npi = filtered_df['_safe_npi'].iat[0]
+                insurance = str(plan).strip()
                 output_path = os.path.join(output_folder, safe_npi, insurance)
-                os.makedirs(output_path, exist_ok=True)
                 
                 # Get filename from data
                 group_filename = str(filtered_df.iloc[0]['OpenNegGroup']).strip()
                 if not group_filename.lower().endswith('.xlsx'):
                     group_filename += '.xlsx'
                 
-                # Save Excel file
+                # Queue the write; only this group's rows are sent to a worker
                 full_path = os.path.join(output_path, group_filename)
-                output_df.to_excel(full_path, index=False)
-                
-                stats.add_success(full_path)
-                self.log_debug(f"Created: {full_path}")
+                header, rows = frame_to_rows(output_df)
+                pending.append((npi, (full_path, header, rows)))
                 
             except Exception as e:
-                stats.add_failure(f"Failed for NPI {row.get('ProvOrgNPI')}: {str(e)}")
+                stats.add_failure(f"Failed for NPI {npi}: {str(e)}")
                 self.log_error(f"Error processing group: {e}")
         
+        # Create all group folders in one pass; a failed folder surfaces as
+        # a write error for the groups inside it
+        for path, error in _create_dirs({os.path.dirname(job[0]) for _, job in pending}).items():
+            self.log_warning(f"Could not create {path}: {error}")
+        
+        errors = await self._write_group_files([job for _, job in pending])
+        for (npi, (full_path, _, _)), error in zip(pending, errors):
+            if error is None:
+                stats.add_success(full_path)
+                self.log_debug("Created: %s", full_path)
+            else:
+                stats.add_failure(f"Failed for NPI {npi}: {error}")
+                self.log_error(f"Error processing group: {error}")
+        
         return stats
     
+    async def _write_group_files(
+        self,
+        jobs: List[Tuple[str, List[str], List[tuple]]]
+    ) -> List[Optional[str]]:
+        """
+        Write group files off the event loop, on a thread pool when parallel
+        processing is enabled and there are enough files.
+        
+        Args:
+            jobs: (output path, header, rows) per group file
+            
+        Returns:
+            Per-job error message, or None for success
+        """
+        max_workers = None if self.config.enable_parallel_processing else 1
+        return await asyncio.to_thread(run_jobs, _write_group_file, jobs, max_workers)
+    
     @staticmethod
     def _format_currency(x) -> str:
         """Format value as currency or N/A."""
@@ -225,6 +309,7 @@ class NoticeGenerationAgent(BaseAgent):
     def __init__(self, name: str = "NoticeGenerationAgent", config: Optional[Dict[str, Any]] = None):
         """Initialize the NoticeGenerationAgent."""
         super().__init__(name, config)
+        self.pdf_backend = str(self.config.custom_settings.get("pdf_backend", "word")).lower()
     
     async def execute(self, task: DocumentTask) -> DocumentTask:
         """
@@ -250,10 +335,12 @@ class NoticeGenerationAgent(BaseAgent):
                 task.mark_failed("Missing required input_data fields")
                 return task
             
-            stats = await self._generate_notices(excel_path, template_path, output_folder)
+            stats = await self._generate_notices(
+                excel_path, template_path, output_folder, input_data.get("grouped_input")
+            )
             stats.duration_seconds = self.get_elapsed_seconds()
             
-            task.metadata["stats"] = stats.to_dict()
+            task.metadata.stats = stats.to_dict()
             
             if stats.failed == 0:
                 task.mark_completed(stats.to_dict())
@@ -276,155 +363,141 @@ class NoticeGenerationAgent(BaseAgent):
         self, 
         excel_path: str, 
         template_path: str, 
-        output_folder: str
+        output_folder: str,
+        grouped_input: Optional[GroupedInput] = None
     ) -> GenerationStats:
         """
         Generate notice Word/PDF files from input data.
         
+        Rows are rendered to .docx concurrently on a thread pool, then all
+        documents are converted to PDF in a single converter session.
+        
         Args:
             excel_path: Path to input Excel file
             template_path: Path to Word template
             output_folder: Base folder for output files
+            grouped_input: Pre-grouped source shared with other agents;
+                built from ``excel_path`` when not provided
             
         Returns:
             GenerationStats with counts and file paths
         """
-        from docx import Document
-        import pythoncom
-        
         stats = GenerationStats()
         
-        # Initialize COM for PDF conversion
-        pythoncom.CoInitialize()
+        # Read and prepare data (dedup is shared when the orchestrator prebuilt it)
+        if grouped_input is None:
+            grouped_input = GroupedInput.from_frame(load_excel_cached(excel_path))
         
-        try:
-            # Read and prepare data
-            df = pd.read_excel(excel_path, engine='openpyxl')
-            df.columns = df.columns.str.strip()
-            
-            # Get unique combinations for notices
-            df_unique = df.drop_duplicates(
-                subset=['ProvOrgNPI', 'Hospital Name', 'OpenNegNotice', 'InsurancePlanName']
-            )
-            stats.total_records = len(df_unique)
-            
-            os.makedirs(output_folder, exist_ok=True)
-            self.log_info(f"Processing {stats.total_records} unique notice combinations")
-            
-            for idx, row in df_unique.iterrows():
-                try:
-                    # Skip if no OpenNegNotice value
-                    if pd.isna(row.get('OpenNegNotice')):
-                        stats.add_skipped()
-                        continue
-                    
-                    # Load template
-                    doc = Document(template_path)
-                    
-                    # Prepare replacements
-                    replacements = {
-                        '{Hospital Name}': str(row.get('Hospital Name', '')),
-                        '{Provider}': str(row.get('Provider', '')),
-                        '{InsurancePlanName}': str(row.get('InsurancePlanName', '')),
-                        '{Notice Date}': str(row.get('Notice Date', '')),
-                        '{CMS Date1}': str(row.get('CMS Date1', '')),
-                        '{CMS Date2}': str(row.get('CMS Date2', '')),
-                    }
-                    bold_keys = set(replacements.keys())
-                    
-                    # Replace placeholders in paragraphs
-                    for paragraph in doc.paragraphs:
-                        self._replace_placeholders(paragraph, replacements, bold_keys)
-                    
-                    # Replace placeholders in tables
-                    for table in doc.tables:
-                        for table_row in table.rows:
-                            for cell in table_row.cells:
-                                for paragraph in cell.paragraphs:
-                                    self._replace_placeholders(paragraph, replacements, bold_keys)
-                    
-                    # Create output path
-                    save_path = os.path.join(
-                        output_folder, 
-                        str(row['ProvOrgNPI']), 
-                        str(row['InsurancePlanName'])
-                    )
-                    os.makedirs(save_path, exist_ok=True)
-                    
-                    # Prepare filenames
-                    notice_filename = str(row['OpenNegNotice']).strip()
-                    base_filename = os.path.splitext(notice_filename)[0]
-                    docx_path = os.path.join(save_path, base_filename + ".docx")
-                    pdf_path = os.path.join(save_path, base_filename + ".pdf")
-                    
-                    # Save Word document
-                    doc.save(docx_path)
-                    
-                    # Convert to PDF
-                    try:
-                        from docx2pdf import convert
-                        convert(docx_path, pdf_path)
-                        stats.add_success(pdf_path)
-                    except Exception as pdf_error:
-                        # PDF conversion failed, but Word doc was saved
-                        self.log_warning(f"PDF conversion failed: {pdf_error}")
-                        stats.add_success(docx_path)
-                    
-                    self.log_debug(f"Created: {docx_path}")
-                    
-                except Exception as e:
-                    stats.add_failure(f"Failed for NPI {row.get('ProvOrgNPI')}: {str(e)}")
-                    self.log_error(f"Error processing notice: {e}")
-            
+        # Unique combinations for notices
+        df_unique = grouped_input.df.loc[grouped_input.notice_unique_index]
+        stats.total_records = len(df_unique)
+        
+        os.makedirs(output_folder, exist_ok=True)
+        self.log_info(f"Processing {stats.total_records} unique notice combinations")
+        
+        # Skip rows with no OpenNegNotice value in one vectorized pass
+        has_notice = df_unique['OpenNegNotice'].notna()
+        stats.skipped = int((~has_notice).sum())
+        jobs: List[Dict[str, Any]] = df_unique[has_notice].to_dict(orient='records')
+        
+        if not jobs:
             return stats
-            
-        finally:
-            pythoncom.CoUninitialize()
+        
+        # Create all notice folders up front instead of once per render
+        for path, error in _create_dirs({self._notice_folder(output_folder, row) for row in jobs}).items():
+            self.log_warning(f"Could not create {path}: {error}")
+        
+        # Read the template once (cached across runs); each render parses it from memory
+        template_bytes = load_template_bytes(template_path)
+        
+        max_workers = min(len(jobs), os.cpu_count() or 1) if self.config.enable_parallel_processing else 1
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="notice") as pool:
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, self._render_notice, row, template_bytes, output_folder)
+                    for row in jobs
+                ),
+                return_exceptions=True
+            )
+        
+        rendered: List[Tuple[str, str]] = []
+        for row, outcome in zip(jobs, results):
+            if isinstance(outcome, Exception):
+                stats.add_failure(f"Failed for NPI {row.get('ProvOrgNPI')}: {str(outcome)}")
+                self.log_error(f"Error processing notice: {outcome}")
+            else:
+                rendered.append(outcome)
+        
+        # Convert all saved documents in one converter session
+        converted: Set[str] = set()
+        if rendered:
+            converted, pdf_error = await asyncio.to_thread(convert_to_pdf_batch, rendered, self.pdf_backend)
+            if pdf_error is not None:
+                # PDF conversion failed, but Word docs were saved
+                self.log_warning(f"PDF conversion failed: {pdf_error}")
+        
+        for docx_path, pdf_path in rendered:
+            stats.add_success(pdf_path if pdf_path in converted else docx_path)
+            self.log_debug("Created: %s", docx_path)
+        
+        return stats
     
-    def _replace_placeholders(
-        self, 
-        paragraph, 
-        replacements: Dict[str, str], 
-        bold_keys: set
-    ) -> None:
+    def _render_notice(
+        self,
+        row: Dict[str, Any],
+        template_bytes: bytes,
+        output_folder: str
+    ) -> Tuple[str, str]:
         """
-        Replace placeholders in a paragraph with values.
+        Render one notice to .docx (thread-pool worker).
+        
+        PDF conversion is deferred so the whole batch can share one
+        converter session.
         
         Args:
-            paragraph: docx Paragraph object
-            replacements: Dictionary of placeholder -> replacement value
-            bold_keys: Set of placeholders that should be bolded
-        """
-        full_text = "".join(run.text for run in paragraph.runs)
-        
-        replaced = False
-        for placeholder, replacement in replacements.items():
-            if placeholder in full_text:
-                full_text = full_text.replace(placeholder, replacement)
-                replaced = True
-        
-        if replaced:
-            # Clear existing runs
-            for run in paragraph.runs:
-                run.text = ""
+            row: Source row as a column -> value dict
+            template_bytes: Raw contents of the Word template
+            output_folder: Base folder for output files
             
-            # Rebuild with formatting
-            i = 0
-            while i < len(full_text):
-                match_found = False
-                for placeholder, replacement in replacements.items():
-                    rep_len = len(replacement)
-                    if full_text[i:i + rep_len] == replacement:
-                        run = paragraph.add_run(replacement)
-                        if placeholder in bold_keys:
-                            run.bold = True
-                        i += rep_len
-                        match_found = True
-                        break
-                
-                if not match_found:
-                    paragraph.add_run(full_text[i])
-                    i += 1
+        Returns:
+            (saved .docx path, target .pdf path)
+        """
+        from docx import Document
+        
+        # Load template from the in-memory copy
+        doc = Document(io.BytesIO(template_bytes))
+        
+        # Prepare replacements
+        replacements = {
+            '{Hospital Name}': str(row.get('Hospital Name', '')),
+            '{Provider}': str(row.get('Provider', '')),
+            '{InsurancePlanName}': str(row.get('InsurancePlanName', '')),
+            '{Notice Date}': str(row.get('Notice Date', '')),
+            '{CMS Date1}': str(row.get('CMS Date1', '')),
+            '{CMS Date2}': str(row.get('CMS Date2', '')),
+        }
+        
+        # Replace placeholders (bolded) in body paragraphs and table cells
+        fill_placeholders(doc, replacements)
+        
+        # Output folder is created by _generate_notices before rendering
+        save_path = self._notice_folder(output_folder, row)
+        
+        # Prepare filenames
+        notice_filename = str(row['OpenNegNotice']).strip()
+        base_filename = os.path.splitext(notice_filename)[0]
+        docx_path = os.path.join(save_path, base_filename + ".docx")
+        pdf_path = os.path.join(save_path, base_filename + ".pdf")
+        
+        # Save Word document
+        doc.save(docx_path)
+        return docx_path, pdf_path
+    
+    @staticmethod
+    def _notice_folder(output_folder: str, row: Dict[str, Any]) -> str:
+        """Return the NPI/plan folder a notice row is saved to."""
+        return os.path.join(output_folder, str(row['ProvOrgNPI']), str(row['InsurancePlanName']))
 
 
 class MergeAgent(BaseAgent):
@@ -438,8 +511,17 @@ class MergeAgent(BaseAgent):
     ALLOWED_EXTENSIONS = {".xls", ".xlsx", ".doc", ".docx", ".pdf"}
     
     def __init__(self, name: str = "MergeAgent", config: Optional[Dict[str, Any]] = None):
-        """Initialize the MergeAgent."""
+        """
+        Initialize the MergeAgent.
+        
+        Merged files are independent copies by default. Set
+        ``custom_settings["merge_use_hardlinks"] = True`` to hardlink them
+        instead (faster, but merged files then share their inode with the
+        group/notice outputs, so editing or cleaning up one tree affects the
+        other).
+        """
         super().__init__(name, config)
+        self.use_hardlinks = bool(self.config.custom_settings.get("merge_use_hardlinks", False))
     
     async def execute(self, task: DocumentTask) -> DocumentTask:
         """
@@ -468,7 +550,7 @@ class MergeAgent(BaseAgent):
             stats = await self._merge_folders(folder1, folder2, output_folder)
             stats.duration_seconds = self.get_elapsed_seconds()
             
-            task.metadata["stats"] = stats.to_dict()
+            task.metadata.stats = stats.to_dict()
             task.mark_completed(stats.to_dict())
             
             self.log_info(f"Merge completed: {stats.successful} files copied")
@@ -496,54 +578,92 @@ class MergeAgent(BaseAgent):
         Returns:
             GenerationStats with file counts
         """
-        import shutil
-        
         stats = GenerationStats()
         os.makedirs(output_folder, exist_ok=True)
         
+        # Names already present per destination folder, listed once and then
+        # updated in memory so collisions need no extra stat calls
+        existing_names: Dict[str, Set[str]] = {}
+        
         for root_folder in [folder1, folder2]:
             if not os.path.exists(root_folder):
                 self.log_warning(f"Source folder not found: {root_folder}")
                 continue
             
-            for root, _, files in os.walk(root_folder):
+            pending_dirs = [root_folder]
+            while pending_dirs:
+                root = pending_dirs.pop()
                 rel_path = os.path.relpath(root, root_folder)
                 dest_subfolder = os.path.join(output_folder, rel_path)
                 os.makedirs(dest_subfolder, exist_ok=True)
                 
-                for file in files:
-                    ext = os.path.splitext(file)[1].lower()
-                    if ext in self.ALLOWED_EXTENSIONS:
-                        stats.total_records += 1
-                        try:
-                            src_path = os.path.join(root, file)
-                            dest_path = self._safe_copy(src_path, dest_subfolder)
-                            stats.add_success(dest_path)
-                        except Exception as e:
-                            stats.add_failure(f"Failed to copy {file}: {str(e)}")
+                existing = existing_names.get(dest_subfolder)
+                if existing is None:
+                    with os.scandir(dest_subfolder) as entries:
+                        existing = {os.path.normcase(entry.name) for entry in entries}
+                    existing_names[dest_subfolder] = existing
+                
+                with os.scandir(root) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending_dirs.append(entry.path)
+                            continue
+                        
+                        ext = os.path.splitext(entry.name)[1].lower()
+                        if ext in self.ALLOWED_EXTENSIONS:
+                            stats.total_records += 1
+                            try:
+                                dest_path = self._safe_copy(entry.path, dest_subfolder, existing)
+                                stats.add_success(dest_path)
+                            except Exception as e:
+                                stats.add_failure(f"Failed to copy {entry.name}: {str(e)}")
         
         return stats
     
-    def _safe_copy(self, src_path: str, dest_folder: str) -> str:
+    def _safe_copy(
+        self,
+        src_path: str,
+        dest_folder: str,
+        existing: Optional[Set[str]] = None
+    ) -> str:
         """
         Copy file with automatic renaming if destination exists.
         
+        Hardlinks the file when enabled, falling back to a full copy when
+        the destination is on another filesystem or links are unsupported.
+        
         Args:
             src_path: Source file path
             dest_folder: Destination folder
+            existing: Normalized names already in ``dest_folder``; listed
+                from disk when omitted and updated with the chosen name
             
         Returns:
             Path to copied file
         """
         import shutil
         
+        if existing is None:
+            with os.scandir(dest_folder) as entries:
+                existing = {os.path.normcase(entry.name) for entry in entries}
+        
         base, ext = os.path.splitext(os.path.basename(src_path))
         counter = 1
-        final_path = os.path.join(dest_folder, base + ext)
+        final_name = base + ext
         
-        while os.path.exists(final_path):
-            final_path = os.path.join(dest_folder, f"{base}_{counter}{ext}")
+        while os.path.normcase(final_name) in existing:
+            final_name = f"{base}_{counter}{ext}"
             counter += 1
         
+        existing.add(os.path.normcase(final_name))
+        final_path = os.path.join(dest_folder, final_name)
+        
+        if self.use_hardlinks:
+            try:
+                os.link(src_path, final_path)
+                return final_path
+            except OSError:
+                pass
+        
         shutil.copy2(src_path, final_path)
         return final_path
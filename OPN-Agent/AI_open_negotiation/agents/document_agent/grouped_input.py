@@ -0,0 +1,93 @@
+"""
+Shared pre-grouped input for the generation agents.
+
+The group and notice generators both work off the same source sheet. Building
+a GroupedInput once at pipeline entry lets them share the grouping, dedup and
+column preparation instead of repeating it per agent.
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Columns that identify one group file / one notice
+GROUP_KEYS = ('ProvOrgNPI', 'Provider', 'InsurancePlanName')
+NOTICE_KEYS = ('ProvOrgNPI', 'Hospital Name', 'OpenNegNotice', 'InsurancePlanName')
+
+DATE_COLUMN = 'Date of item(s) or service(s)'
+
+
+@dataclass
+class GroupedInput:
+    """
+    Source data grouped once and shared by the generation agents.
+
+    Treat ``df`` as read-only; it is shared between agents that may run
+    concurrently. The group index and notice dedup are built on first
+    access, so a sheet made for only one generator still works for it.
+
+    Attributes:
+        df: Source rows plus the prepared ``_safe_npi`` column and, when the
+            service date column is present, ``_date_fmt``
+    """
+    df: pd.DataFrame
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "GroupedInput":
+        """
+        Prepare a source DataFrame for grouping.
+
+        Args:
+            df: Source DataFrame with stripped column names (not modified)
+
+        Returns:
+            GroupedInput over a shallow copy of ``df``
+        """
+        df = df.copy(deep=False)
+
+        # Parse/format dates once for the whole sheet rather than per group
+        if DATE_COLUMN in df.columns:
+            df['_date_fmt'] = pd.to_datetime(df[DATE_COLUMN], errors='coerce').dt.strftime('%b %d, %Y')
+
+        # Sanitize NPIs for folder names in one regex pass (same rule as _safe_filename)
+        if 'ProvOrgNPI' in df.columns:
+            df['_safe_npi'] = df['ProvOrgNPI'].astype(str).str.replace(r'\W', '_', regex=True)
+
+        return cls(df=df)
+
+    @cached_property
+    def group_index(self) -> Dict[Tuple, np.ndarray]:
+        """
+        GROUP_KEYS tuple -> row positions, in first-seen order.
+
+        NaN keys are included so they can be counted as skipped.
+        """
+        return self.df.groupby(list(GROUP_KEYS), sort=False, dropna=False).indices
+
+    @cached_property
+    def notice_unique_index(self) -> pd.Index:
+        """Index labels of the first row per NOTICE_KEYS combination."""
+        # One uint64 hash per row over the notice keys; keep first occurrences
+        keys = pd.util.hash_pandas_object(self.df[list(NOTICE_KEYS)], index=False)
+        return self.df.index[~keys.duplicated().to_numpy()]
+
+    def prepare(self) -> "GroupedInput":
+        """
+        Build every index whose key columns are present.
+
+        Lets callers do the grouping work up front (e.g. off the event loop)
+        without failing on sheets that only feed one generator.
+
+        Returns:
+            self
+        """
+        columns = set(self.df.columns)
+        if columns.issuperset(GROUP_KEYS):
+            self.group_index
+        if columns.issuperset(NOTICE_KEYS):
+            self.notice_unique_index
+        return self
@@ -0,0 +1,452 @@
+"""
+File I/O helpers shared by the document generators.
+
+Cached Excel/template loading, template placeholder filling, plain-row .xlsx
+writing and batch .docx -> PDF conversion, used by the generation agents and the
+legacy DocumentSkill.
+"""
+
+import importlib.util
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+
+
+# Rust-backed calamine parses .xlsx and .xls far faster than openpyxl/xlrd;
+# None lets pandas pick its default engine for the file extension
+_EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+
+# xlsxwriter streams rows to disk in constant_memory mode and is faster than
+# openpyxl's write-only workbook; used for group files when installed
+_HAS_XLSXWRITER = importlib.util.find_spec("xlsxwriter") is not None
+
+# reportlab renders notices straight to PDF without Word or LibreOffice
+# (pdf_backend="reportlab"); optional
+_HAS_REPORTLAB = importlib.util.find_spec("reportlab") is not None
+
+
+# Below this many independent jobs a worker pool costs more than it saves
+PARALLEL_MIN_JOBS = 8
+
+
+# Input columns used by the group and notice generators
+_GENERATION_COLUMNS = frozenset({
+    'ProvOrgNPI', 'Provider', 'InsurancePlanName', 'Hospital Name',
+    'OpenNegGroup', 'OpenNegNotice', 'CPT_Description', 'Claim Number',
+    'Date of item(s) or service(s)', 'Service code(s)', 'Initial Payment',
+    'Offer', 'Notice Date', 'CMS Date1', 'CMS Date2',
+})
+
+
+# Parsed workbooks keyed by (path, mtime_ns, size, all_columns); LRU order
+_EXCEL_CACHE: "OrderedDict[Tuple[str, int, int, bool], pd.DataFrame]" = OrderedDict()
+_EXCEL_CACHE_SIZE = 8
+_EXCEL_CACHE_LOCK = threading.Lock()
+
+
+def _read_excel(path: str, all_columns: bool) -> pd.DataFrame:
+    """
+    Parse an Excel workbook with stripped column names.
+    
+    Unless ``all_columns`` is set, only ``_GENERATION_COLUMNS`` are parsed
+    (matched after stripping), so unused columns skip dtype inference and
+    are not held in memory.
+    """
+    df = pd.read_excel(
+        path,
+        engine=_EXCEL_ENGINE,
+        usecols=None if all_columns else (lambda name: str(name).strip() in _GENERATION_COLUMNS)
+    )
+    df.columns = df.columns.str.strip()
+    return df
+
+
+def load_excel_cached(excel_path: str, all_columns: bool = False) -> pd.DataFrame:
+    """
+    Return a shallow copy of the cached DataFrame for ``excel_path``.
+    
+    The generators' column subset is parsed on its own, but a cached
+    full-column parse (e.g. from data analysis) of the same file serves both
+    variants, so analyze-then-generate reads the workbook once. Entries are
+    keyed by path, mtime and size, so edits are picked up.
+    
+    Args:
+        excel_path: Path to the Excel file
+        all_columns: Keep every column instead of ``_GENERATION_COLUMNS``
+        
+    Returns:
+        DataFrame to treat as read-only apart from adding columns
+    """
+    path = os.path.abspath(excel_path)
+    st = os.stat(path)
+    base_key = (path, st.st_mtime_ns, st.st_size)
+    
+    with _EXCEL_CACHE_LOCK:
+        df = None
+        for key in [base_key + (True,)] + ([] if all_columns else [base_key + (False,)]):
+            df = _EXCEL_CACHE.get(key)
+            if df is not None:
+                _EXCEL_CACHE.move_to_end(key)
+                break
+    
+    if df is None:
+        df = _read_excel(path, all_columns)
+        with _EXCEL_CACHE_LOCK:
+            _EXCEL_CACHE[base_key + (all_columns,)] = df
+            while len(_EXCEL_CACHE) > _EXCEL_CACHE_SIZE:
+                _EXCEL_CACHE.popitem(last=False)
+    
+    if all_columns:
+        return df.copy(deep=False)
+    return df[[c for c in df.columns if c in _GENERATION_COLUMNS]]
+
+
+@lru_cache(maxsize=8)
+def _read_template(path: str, mtime: float) -> bytes:
+    """Read a Word template's raw bytes once per (path, mtime)."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def load_template_bytes(template_path: str) -> bytes:
+    """Return the cached raw bytes of the Word template at ``template_path``."""
+    path = os.path.abspath(template_path)
+    return _read_template(path, os.path.getmtime(path))
+
+
+@lru_cache(maxsize=16)
+def placeholder_pattern(placeholders: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile one alternation regex over the given placeholders (longest first)."""
+    ordered = sorted(placeholders, key=len, reverse=True)
+    return re.compile("|".join(re.escape(p) for p in ordered))
+
+
+def replace_placeholders(
+    paragraph,
+    replacements: Dict[str, str],
+    bold_keys: Optional[Set[str]] = None
+) -> None:
+    """
+    Replace placeholders in a paragraph with values.
+    
+    The paragraph's runs are rebuilt in one pass: plain text between matches,
+    then one run per substituted value. Tabs and newlines in the text become
+    ``w:tab`` / ``w:br``.
+    
+    Args:
+        paragraph: docx Paragraph object
+        replacements: Dictionary of placeholder -> replacement value
+        bold_keys: Placeholders whose values are bolded (default: all)
+    """
+    from docx.oxml import OxmlElement
+    
+    if bold_keys is None:
+        bold_keys = replacements.keys()
+    
+    full_text = "".join(run.text for run in paragraph.runs)
+    pattern = placeholder_pattern(tuple(replacements))
+    
+    matches = list(pattern.finditer(full_text))
+    if not matches:
+        return
+    
+    def make_run(text: str, bold: bool = False):
+        r = OxmlElement('w:r')
+        if bold:
+            r.get_or_add_rPr().append(OxmlElement('w:b'))
+        r.text = text  # CT_R setter maps \t and \n to w:tab / w:br
+        return r
+    
+    # Rebuild in one pass: plain text between matches, then the replacement
+    new_runs = []
+    last = 0
+    for match in matches:
+        if match.start() > last:
+            new_runs.append(make_run(full_text[last:match.start()]))
+        placeholder = match.group()
+        new_runs.append(make_run(replacements[placeholder], placeholder in bold_keys))
+        last = match.end()
+    
+    if last < len(full_text):
+        new_runs.append(make_run(full_text[last:]))
+    
+    # Swap the runs directly on the <w:p> element
+    p = paragraph._p
+    for r in p.r_lst:
+        p.remove(r)
+    p.extend(new_runs)
+
+
+def fill_placeholders(
+    doc,
+    replacements: Dict[str, str],
+    bold_keys: Optional[Set[str]] = None
+) -> None:
+    """
+    Replace placeholders throughout a document's body paragraphs and tables.
+    
+    Args:
+        doc: docx Document object
+        replacements: Dictionary of placeholder -> replacement value
+        bold_keys: Placeholders whose values are bolded (default: all)
+    """
+    has_placeholder = placeholder_pattern(tuple(replacements)).search
+    
+    # Most paragraphs contain no placeholder, so skip those early
+    for paragraph in doc.paragraphs:
+        if has_placeholder(paragraph.text):
+            replace_placeholders(paragraph, replacements, bold_keys)
+    
+    for table in doc.tables:
+        for table_row in table.rows:
+            for cell in table_row.cells:
+                if not has_placeholder(cell.text):
+                    continue
+                for paragraph in cell.paragraphs:
+                    if has_placeholder(paragraph.text):
+                        replace_placeholders(paragraph, replacements, bold_keys)
+
+
+def run_jobs(
+    func: Callable[[Any], Any],
+    jobs: Sequence[Any],
+    max_workers: Optional[int] = None
+) -> List[Any]:
+    """
+    Apply ``func`` to each job, on a thread pool when there are enough jobs.
+    
+    Threads rather than processes: the writers release the GIL for file I/O,
+    and spawned workers (the default on Windows) would re-import pandas and
+    python-docx per pool, which costs more than typical batches take.
+    
+    Args:
+        func: Function called once per job
+        jobs: Independent work items
+        max_workers: Thread cap (default: CPU count); 1 runs inline
+        
+    Returns:
+        Results in job order
+    """
+    workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+    if workers < 2 or len(jobs) < PARALLEL_MIN_JOBS:
+        return [func(job) for job in jobs]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, jobs))
+
+
+def frame_to_rows(df: pd.DataFrame) -> Tuple[List[str], List[tuple]]:
+    """Convert a DataFrame to a header list and plain row tuples (NaN -> None)."""
+    values = df.astype(object).where(df.notna(), None)
+    return [str(c) for c in df.columns], list(values.itertuples(index=False, name=None))
+
+
+def write_xlsx_rows(path: str, header: List[str], rows: List[tuple]) -> None:
+    """
+    Write plain rows to .xlsx, flushing each row as it is written.
+    
+    Uses xlsxwriter in ``constant_memory`` mode when available, otherwise an
+    openpyxl write-only workbook. Plain values only (no styling), which is
+    all the group files need and much faster than ``DataFrame.to_excel``.
+    ``None`` becomes an empty cell.
+    
+    Args:
+        path: Destination .xlsx path
+        header: Column labels for the first row
+        rows: Data rows
+    """
+    if _HAS_XLSXWRITER:
+        import xlsxwriter
+        
+        wb = xlsxwriter.Workbook(path, {'constant_memory': True, 'strings_to_urls': False})
+        ws = wb.add_worksheet()
+        ws.write_row(0, 0, header)
+        for row_idx, row in enumerate(rows, start=1):
+            ws.write_row(row_idx, 0, row)
+        wb.close()
+        return
+    
+    from openpyxl import Workbook
+    
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(header)
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+
+def _convert_folder_with_word(folder: str) -> None:
+    """Convert every .docx in ``folder`` to PDF within one Word (COM) session."""
+    import pythoncom
+    from docx2pdf import convert
+    
+    pythoncom.CoInitialize()
+    try:
+        convert(folder)
+    finally:
+        pythoncom.CoUninitialize()
+
+
+# Smallest number of documents worth a separate soffice process
+_SOFFICE_MIN_SHARD = 25
+
+
+def _convert_with_soffice(soffice: str, docx_paths: List[str], outdir: str) -> None:
+    """
+    Convert .docx files to PDF in ``outdir`` with headless LibreOffice.
+    
+    Large batches are split across several ``soffice`` processes run side by
+    side, each with its own user profile (LibreOffice serializes on a shared
+    profile).
+    """
+    import subprocess
+    import tempfile
+    
+    shards = max(1, min(os.cpu_count() or 1, len(docx_paths) // _SOFFICE_MIN_SHARD))
+    
+    def run(i: int) -> None:
+        with tempfile.TemporaryDirectory(prefix=f"lo_profile_{i}_") as profile:
+            subprocess.run(
+                [
+                    soffice, f"-env:UserInstallation={Path(profile).as_uri()}",
+                    "--headless", "--convert-to", "pdf", "--outdir", outdir,
+                    *docx_paths[i::shards],
+                ],
+                check=True,
+                capture_output=True,
+            )
+    
+    if shards == 1:
+        run(0)
+        return
+    with ThreadPoolExecutor(max_workers=shards, thread_name_prefix="soffice") as pool:
+        list(pool.map(run, range(shards)))
+
+
+def _render_pdf_direct(docx_path: str, pdf_path: str) -> None:
+    """
+    Render a filled-in notice .docx to PDF with reportlab.
+    
+    Paragraphs (bold runs and heading styles kept) and tables are laid out
+    in document order on letter pages. Headers, images and exact Word
+    layout are not reproduced; use the Word backend when fidelity matters.
+    
+    Args:
+        docx_path: Saved notice document
+        pdf_path: Destination PDF path
+    """
+    from xml.sax.saxutils import escape
+    
+    from docx import Document
+    from docx.table import Table as DocxTable
+    from docx.text.paragraph import Paragraph as DocxParagraph
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+    
+    styles = getSampleStyleSheet()
+    
+    def markup(paragraph: DocxParagraph) -> str:
+        parts = []
+        for run in paragraph.runs:
+            text = escape(run.text)
+            parts.append(f"<b>{text}</b>" if run.bold and text else text)
+        return "".join(parts)
+    
+    doc = Document(docx_path)
+    story = []
+    for child in doc.element.body.iterchildren():
+        tag = child.tag.rsplit('}', 1)[-1]
+        if tag == 'p':
+            paragraph = DocxParagraph(child, doc)
+            text = markup(paragraph)
+            if not text.strip():
+                story.append(Spacer(1, 6))
+                continue
+            style_name = paragraph.style.name.replace('Heading ', 'Heading') if paragraph.style is not None else ''
+            style = styles[style_name] if style_name in styles else styles['Normal']
+            story.append(Paragraph(text, style))
+        elif tag == 'tbl':
+            table = DocxTable(child, doc)
+            data = [
+                [Paragraph(escape(cell.text), styles['Normal']) for cell in row.cells]
+                for row in table.rows
+            ]
+            if data:
+                story.append(Table(data, style=TableStyle([
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ])))
+    
+    SimpleDocTemplate(pdf_path, pagesize=letter).build(story)
+
+
+def convert_to_pdf_batch(
+    pairs: List[Tuple[str, str]],
+    backend: str = "word"
+) -> Tuple[Set[str], Optional[str]]:
+    """
+    Convert many .docx files to PDF with a single converter session.
+    
+    The documents are staged under unique names in one temporary folder so
+    Word is launched once for the whole batch; headless LibreOffice is used
+    as a fallback when Word/COM is unavailable, or directly when
+    ``backend`` is "soffice". With "reportlab" (when installed) each
+    document is rendered directly and no converter is launched.
+    
+    Args:
+        pairs: (source .docx path, target .pdf path) per document
+        backend: "word" (docx2pdf, LibreOffice fallback), "soffice" or "reportlab"
+        
+    Returns:
+        (set of PDF paths that were produced, converter error message or None)
+    """
+    import shutil
+    import tempfile
+    
+    converted: Set[str] = set()
+    if backend == "reportlab" and _HAS_REPORTLAB:
+        errors = []
+        for docx_path, pdf_path in pairs:
+            try:
+                _render_pdf_direct(docx_path, pdf_path)
+                converted.add(pdf_path)
+            except Exception as e:
+                errors.append(f"{docx_path}: {e}")
+        return converted, "; ".join(errors) or None
+    
+    with tempfile.TemporaryDirectory(prefix="notice_pdf_") as staging:
+        staged = []
+        for i, (docx_path, _) in enumerate(pairs):
+            staged_path = os.path.join(staging, f"{i}.docx")
+            shutil.copyfile(docx_path, staged_path)
+            staged.append(staged_path)
+        
+        try:
+            if backend == "soffice":
+                raise RuntimeError("LibreOffice backend selected")
+            _convert_folder_with_word(staging)
+        except Exception as word_error:
+            soffice = shutil.which("soffice") or shutil.which("libreoffice")
+            if soffice is None:
+                return converted, "LibreOffice not found" if backend == "soffice" else str(word_error)
+            try:
+                _convert_with_soffice(soffice, staged, staging)
+            except Exception as soffice_error:
+                return converted, str(soffice_error)
+        
+        for i, (_, pdf_path) in enumerate(pairs):
+            staged_pdf = os.path.join(staging, f"{i}.pdf")
+            if os.path.exists(staged_pdf):
+                shutil.move(staged_pdf, pdf_path)
+                converted.add(pdf_path)
+    
+    return converted, None
@@ -6,17 +6,22 @@ processing pipeline with parallel execution and error aggregation.
 """
 
 import asyncio
+import itertools
+import os
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-from uuid import uuid4
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+import pandas as pd
 
 from AI_open_negotiation.agents.document_agent.base_agent import BaseAgent
 from AI_open_negotiation.agents.document_agent.validation_agent import ValidationAgent
 from AI_open_negotiation.agents.document_agent.generation_agents import (
     GroupGenerationAgent,
-    NoticeGenerationAgent,
     MergeAgent,
+    NoticeGenerationAgent,
 )
+from AI_open_negotiation.agents.document_agent.grouped_input import GroupedInput
+from AI_open_negotiation.agents.document_agent.io_utils import load_excel_cached
 from AI_open_negotiation.models.task_models import DocumentTask, DocumentType, TaskStatus
 from AI_open_negotiation.models.result_models import (
     GenerationStats,
@@ -25,6 +30,17 @@ from AI_open_negotiation.models.result_models import (
 )
 
 
+# Task IDs only need to be unique within this process; a counter avoids
+# an os.urandom read per ID
+_TASK_SEQ = itertools.count()
+_PID_TAG = f"{os.getpid():x}"
+
+
+def _next_task_id(prefix: str) -> str:
+    """Return a process-unique task ID such as ``val_1a2b3``."""
+    return f"{prefix}_{_PID_TAG}{next(_TASK_SEQ):x}"
+
+
 class OrchestratorAgent(BaseAgent):
     """
     Master orchestrator that coordinates the document processing pipeline.
@@ -55,23 +71,38 @@ class OrchestratorAgent(BaseAgent):
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
-        Initialize the OrchestratorAgent with sub-agents.
+        Initialize the OrchestratorAgent.
+        
+        Sub-agents are constructed on first use, so requests that never reach
+        generation don't pay for the generation agents.
         
         Args:
             config: Configuration dictionary for all agents
         """
         super().__init__("Orchestrator", config)
         
-        # Initialize sub-agents
         agent_config = config or {}
-        self.agents = {
-            'validator': ValidationAgent("ValidationAgent", agent_config),
-            'group_generator': GroupGenerationAgent("GroupGenerator", agent_config),
-            'notice_generator': NoticeGenerationAgent("NoticeGenerator", agent_config),
-            'merger': MergeAgent("MergeAgent", agent_config),
+        self._agent_factories: Dict[str, Callable[[], BaseAgent]] = {
+            'validator': lambda: ValidationAgent("ValidationAgent", agent_config),
+            'group_generator': lambda: GroupGenerationAgent("GroupGenerator", agent_config),
+            'notice_generator': lambda: NoticeGenerationAgent("NoticeGenerator", agent_config),
+            'merger': lambda: MergeAgent("MergeAgent", agent_config),
         }
+        self._agents: Dict[str, BaseAgent] = {}
         
-        self.log_info("Orchestrator initialized with all sub-agents")
+        self.log_info("Orchestrator initialized")
+    
+    def _agent(self, name: str) -> BaseAgent:
+        """Return the named sub-agent, constructing it on first access."""
+        agent = self._agents.get(name)
+        if agent is None:
+            agent = self._agents[name] = self._agent_factories[name]()
+        return agent
+    
+    @property
+    def agents(self) -> Dict[str, BaseAgent]:
+        """All sub-agents by name (constructs any not yet created)."""
+        return {name: self._agent(name) for name in self._agent_factories}
     
     async def execute(self, task: DocumentTask) -> DocumentTask:
         """
@@ -88,19 +119,17 @@ class OrchestratorAgent(BaseAgent):
         self.log_info(f"Starting orchestrated pipeline for task {task.task_id}")
         
         try:
-            result = await self.process_document_request(task.input_data)
+            result = await self._run_pipeline(task.input_data)
+            result_dict = result.to_dict()
             
-            task.metadata["result"] = result
+            task.metadata.result = result_dict
             
-            if result["status"] == "SUCCESS":
-                task.mark_completed(result)
-            elif result["status"] == "PARTIAL_FAILURE":
-                task.mark_partial_failure(
-                    "; ".join(result.get("errors", [])),
-                    result
-                )
+            if result.status == "SUCCESS":
+                task.mark_completed(result_dict)
+            elif result.status == "PARTIAL_FAILURE":
+                task.mark_partial_failure("; ".join(result.errors), result_dict)
             else:
-                task.mark_failed("; ".join(result.get("errors", ["Unknown error"])))
+                task.mark_failed("; ".join(result.errors or ["Unknown error"]))
             
             return task
             
@@ -140,24 +169,60 @@ class OrchestratorAgent(BaseAgent):
         Raises:
             ValueError: If required config keys are missing
         """
+        result = await self.run_pipeline(document_config)
+        return result.to_dict()
+    
+    async def run_pipeline(self, document_config: Dict[str, Any]) -> ProcessingResult:
+        """
+        Run the pipeline and return the ProcessingResult itself.
+        
+        For callers that serialize the result themselves, e.g. with
+        ``ProcessingResult.to_json_bytes()`` for an HTTP response, instead of
+        going through the dict from ``process_document_request``.
+        
+        Args:
+            document_config: See ``process_document_request``
+            
+        Returns:
+            ProcessingResult for the whole pipeline
+        """
         self.start_timer()
+        return await self._run_pipeline(document_config)
+    
+    async def _run_pipeline(self, document_config: Dict[str, Any]) -> ProcessingResult:
+        """
+        Run validation, generation and merge stages.
+        
+        Callers start the timer and serialize the result exactly once.
+        
+        Args:
+            document_config: See ``process_document_request``
+            
+        Returns:
+            ProcessingResult for the whole pipeline
+        """
         result = ProcessingResult(status="PENDING")
         
         try:
             # Validate configuration
             self._validate_config(document_config)
             
+            # Start parsing the source sheet while validation runs; validation
+            # (in deep mode) and the generators all reuse this one parse
+            df_future = self._prefetch_source(document_config["excel_path"])
+            
             # ==================== STAGE 1: VALIDATION ====================
             self.log_info("Stage 1: Validation")
             validation_task = DocumentTask(
-                task_id=f"val_{uuid4().hex[:8]}",
+                task_id=_next_task_id("val"),
                 document_type=DocumentType.OPEN_NEG_GROUP,
-                input_data=document_config
+                input_data={**document_config, "df_future": df_future}
             )
             
-            validation_result = await self.agents['validator'].execute(validation_task)
+            validation_result = await self._agent('validator').execute(validation_task)
             
             if validation_result.status == TaskStatus.FAILED:
+                df_future.cancel()
                 result.status = "FAILED"
                 result.errors.append(f"Validation failed: {validation_result.error_message}")
                 result.validation_result = ValidationResult(
@@ -165,10 +230,10 @@ class OrchestratorAgent(BaseAgent):
                     errors=[validation_result.error_message or "Validation failed"]
                 )
                 result.mark_completed("FAILED")
-                return result.to_dict()
+                return result
             
             # Store validation warnings
-            val_data = validation_result.metadata.get("validation_result", {})
+            val_data = validation_result.metadata.validation_result or {}
             result.validation_result = ValidationResult(
                 is_valid=True,
                 warnings=val_data.get("warnings", []),
@@ -180,36 +245,49 @@ class OrchestratorAgent(BaseAgent):
             # ==================== STAGE 2: GENERATION ====================
             self.log_info("Stage 2: Document Generation")
             
+            # Group the prefetched source once; both generators share it
+            generation_input = dict(document_config)
+            try:
+                df = await df_future
+                generation_input["grouped_input"] = await asyncio.to_thread(
+                    lambda: GroupedInput.from_frame(df).prepare()
+                )
+            except Exception as e:
+                self.log_warning(f"Pre-grouping failed, generators will load input themselves: {e}")
+            
             # Prepare generation tasks
             group_task = DocumentTask(
-                task_id=f"grp_{uuid4().hex[:8]}",
+                task_id=_next_task_id("grp"),
                 document_type=DocumentType.OPEN_NEG_GROUP,
-                input_data=document_config
+                input_data=generation_input
             )
             
             notice_task = DocumentTask(
-                task_id=f"ntc_{uuid4().hex[:8]}",
+                task_id=_next_task_id("ntc"),
                 document_type=DocumentType.OPEN_NEG_NOTICE,
-                input_data=document_config
+                input_data=generation_input
             )
             
             # Execute in parallel or sequential based on config
             if self.config.enable_parallel_processing:
                 self.log_info("Executing generators in parallel")
-                generation_results = await asyncio.gather(
-                    self.agents['group_generator'].execute_with_retry(group_task),
-                    self.agents['notice_generator'].execute_with_retry(notice_task),
-                    return_exceptions=True
-                )
+                async with asyncio.TaskGroup() as tg:
+                    group_run = tg.create_task(self._capture_errors(
+                        self._agent('group_generator').execute_with_retry(group_task)
+                    ))
+                    notice_run = tg.create_task(self._capture_errors(
+                        self._agent('notice_generator').execute_with_retry(notice_task)
+                    ))
+                generation_results = [group_run.result(), notice_run.result()]
             else:
                 self.log_info("Executing generators sequentially")
                 generation_results = [
-                    await self.agents['group_generator'].execute_with_retry(group_task),
-                    await self.agents['notice_generator'].execute_with_retry(notice_task),
+                    await self._agent('group_generator').execute_with_retry(group_task),
+                    await self._agent('notice_generator').execute_with_retry(notice_task),
                 ]
             
             # Aggregate generation results
-            combined_stats = GenerationStats()
+            gen_stats_list: List[GenerationStats] = []
             has_failures = False
             
             for gen_result in generation_results:
@@ -224,18 +302,18 @@ class OrchestratorAgent(BaseAgent):
                         result.warnings.append(gen_result.error_message or "Partial failure")
                         has_failures = True
                     
-                    # Merge statistics
-                    stats_data = gen_result.metadata.get("stats", {})
-                    gen_stats = GenerationStats(
+                    # Collect statistics for a single merge below
+                    stats_data = gen_result.metadata.stats or {}
+                    gen_stats_list.append(GenerationStats(
                         total_records=stats_data.get("total_records", 0),
                         successful=stats_data.get("successful", 0),
                         failed=stats_data.get("failed", 0),
                         skipped=stats_data.get("skipped", 0),
                         duration_seconds=stats_data.get("duration_seconds", 0),
                         errors=stats_data.get("errors", [])
-                    )
-                    combined_stats = combined_stats.merge(gen_stats)
+                    ))
             
+            combined_stats = GenerationStats.merge_many(gen_stats_list)
             result.stats = combined_stats
             
             # Check if all generation failed
@@ -243,18 +321,18 @@ class OrchestratorAgent(BaseAgent):
                 result.status = "FAILED"
                 result.errors.append("All document generation failed")
                 result.mark_completed("FAILED")
-                return result.to_dict()
+                return result
             
             # ==================== STAGE 3: MERGE ====================
             self.log_info("Stage 3: Merging Outputs")
             
             merge_task = DocumentTask(
-                task_id=f"mrg_{uuid4().hex[:8]}",
+                task_id=_next_task_id("mrg"),
                 document_type=DocumentType.MERGED_OUTPUT,
                 input_data=document_config
             )
             
-            merge_result = await self.agents['merger'].execute(merge_task)
+            merge_result = await self._agent('merger').execute(merge_task)
             
             if merge_result.status == TaskStatus.FAILED:
                 result.warnings.append(f"Merge failed: {merge_result.error_message}")
@@ -276,14 +354,27 @@ class OrchestratorAgent(BaseAgent):
                 f"{self.get_elapsed_seconds():.1f}s"
             )
             
-            return result.to_dict()
+            return result
             
         except Exception as e:
             self.log_error(f"Pipeline error: {e}")
             result.status = "FAILED"
             result.errors.append(str(e))
             result.mark_completed("FAILED")
-            return result.to_dict()
+            return result
+    
+    @staticmethod
+    async def _capture_errors(coro: Awaitable[DocumentTask]) -> Union[DocumentTask, Exception]:
+        """
+        Await a generator run, returning its exception instead of raising.
+        
+        Keeps one generator's failure from cancelling its sibling in the
+        TaskGroup; failures are reported as partial results instead.
+        """
+        try:
+            return await coro
+        except Exception as e:
+            return e
     
     def _validate_config(self, config: Dict[str, Any]) -> None:
         """
@@ -309,6 +400,27 @@ class OrchestratorAgent(BaseAgent):
         if "merged_output_folder" not in config:
             config["merged_output_folder"] = "output/merged"
     
+    @staticmethod
+    def _prefetch_source(excel_path: str) -> "asyncio.Task[pd.DataFrame]":
+        """
+        Start loading the source sheet on a worker thread.
+        
+        Uses the generators' (path, mtime) cached loader, so the returned
+        task can be awaited by every stage that needs the DataFrame.
+        
+        Args:
+            excel_path: Path to input Excel file
+            
+        Returns:
+            Task resolving to the cached DataFrame
+        """
+        task = asyncio.create_task(
+            asyncio.to_thread(load_excel_cached, excel_path)
+        )
+        # A failed load is reported by validation; don't also warn about an unretrieved exception
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+    
     async def get_agent_status(self) -> Dict[str, str]:
         """
         Get status of all sub-agents.
@@ -316,4 +428,4 @@ class OrchestratorAgent(BaseAgent):
         Returns:
             Dictionary with agent name -> status
         """
-        return {name: "ready" for name in self.agents.keys()}
+        return {name: "ready" for name in self._agent_factories}
@@ -8,9 +8,17 @@ Provides comprehensive validation of input data including:
 - Template validation for Word documents
 """
 
+import asyncio
+import copy
+import importlib.util
 import os
-from typing import Any, Dict, List, Optional, Set
+import re
+import stat
+import zipfile
+from collections import OrderedDict
+from typing import Any, Awaitable, Dict, FrozenSet, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from AI_open_negotiation.agents.document_agent.base_agent import BaseAgent
@@ -18,6 +26,33 @@ from AI_open_negotiation.models.task_models import DocumentTask, DocumentType, T
 from AI_open_negotiation.models.result_models import ValidationResult
 
 
+# Rust-backed calamine parses .xlsx and .xls far faster than openpyxl/xlrd;
+# None lets pandas pick its default engine for the file extension
+_EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+
+# Any XML tag; removing them joins text split across runs like python-docx does
+_XML_TAG = re.compile(r"<[^>]+>")
+
+
+def _check_rows(npi: np.ndarray, plan_lens: np.ndarray, offer: np.ndarray) -> np.ndarray:
+    """
+    Row-level rules for deep validation, evaluated as one vectorized pass.
+    
+    Args:
+        npi: ProvOrgNPI as float (NaN where missing or non-numeric)
+        plan_lens: Length of the stripped InsurancePlanName (0 where missing)
+        offer: Offer amount as float (NaN where missing or non-numeric)
+        
+    Returns:
+        Boolean mask, True where the row passes every rule
+    """
+    return (
+        (npi >= 1_000_000_000) & (npi <= 9_999_999_999)
+        & (plan_lens > 0)
+        & np.isfinite(offer)
+    )
+
+
 class ValidationAgent(BaseAgent):
     """
     Agent responsible for validating input data before processing.
@@ -40,7 +75,7 @@ class ValidationAgent(BaseAgent):
     """
     
     # Required columns for Open Negotiation documents
-    REQUIRED_COLUMNS_GROUP: Set[str] = {
+    REQUIRED_COLUMNS_GROUP: FrozenSet[str] = frozenset({
         "ProvOrgNPI",
         "Provider",
         "InsurancePlanName",
@@ -51,9 +86,9 @@ class ValidationAgent(BaseAgent):
         "Service code(s)",
         "Initial Payment",
         "Offer",
-    }
+    })
     
-    REQUIRED_COLUMNS_NOTICE: Set[str] = {
+    REQUIRED_COLUMNS_NOTICE: FrozenSet[str] = frozenset({
         "ProvOrgNPI",
         "Hospital Name",
         "Provider",
@@ -62,21 +97,49 @@ class ValidationAgent(BaseAgent):
         "Notice Date",
         "CMS Date1",
         "CMS Date2",
+    })
+    
+    # Union of both, required for general processing
+    REQUIRED_COLUMNS_ANY: FrozenSet[str] = REQUIRED_COLUMNS_GROUP | REQUIRED_COLUMNS_NOTICE
+    
+    # Per document type: (required columns, column whose non-null rows count
+    # as valid records); other types use the union and count every row
+    _TYPE_RULES: Dict[DocumentType, Tuple[FrozenSet[str], Optional[str]]] = {
+        DocumentType.OPEN_NEG_GROUP: (REQUIRED_COLUMNS_GROUP, "OpenNegGroup"),
+        DocumentType.OPEN_NEG_NOTICE: (REQUIRED_COLUMNS_NOTICE, "OpenNegNotice"),
     }
+    _DEFAULT_RULES: Tuple[FrozenSet[str], Optional[str]] = (REQUIRED_COLUMNS_ANY, None)
     
     # Required template placeholders
-    TEMPLATE_PLACEHOLDERS: Set[str] = {
+    TEMPLATE_PLACEHOLDERS: FrozenSet[str] = frozenset({
         "{Hospital Name}",
         "{Provider}",
         "{InsurancePlanName}",
         "{Notice Date}",
         "{CMS Date1}",
         "{CMS Date2}",
-    }
+    })
+    
+    # One alternation over all placeholders so the template text is scanned once
+    _PLACEHOLDER_PATTERN = re.compile(
+        "|".join(map(re.escape, sorted(TEMPLATE_PLACEHOLDERS, key=len, reverse=True)))
+    )
+    
+    # Max cached Excel/template results, keyed by file identity
+    RESULT_CACHE_SIZE = 32
     
     def __init__(self, name: str = "ValidationAgent", config: Optional[Dict[str, Any]] = None):
-        """Initialize the ValidationAgent."""
+        """
+        Initialize the ValidationAgent.
+        
+        By default only the header row and row count of the Excel file are
+        read. Set ``custom_settings["deep_validation"] = True`` to parse the
+        whole sheet and run the null, OpenNegGroup/OpenNegNotice and
+        duplicate claim checks.
+        """
         super().__init__(name, config)
+        self.deep_validation = bool(self.config.custom_settings.get("deep_validation", False))
+        self._result_cache: "OrderedDict[Tuple, ValidationResult]" = OrderedDict()
     
     async def execute(self, task: DocumentTask) -> DocumentTask:
         """
@@ -96,13 +159,44 @@ class ValidationAgent(BaseAgent):
             input_data = task.input_data
             validation_result = ValidationResult(is_valid=True)
             
-            # Validate Excel file
+            # The checks touch disjoint files, so run them concurrently
             excel_path = input_data.get("excel_path")
+            template_path = input_data.get("template_docx")
+            folders = [
+                (folder_key, input_data.get(folder_key))
+                for folder_key in ["output_group_folder", "output_notice_folder", "merged_output_folder"]
+                if input_data.get(folder_key)
+            ]
+            
+            checks: List[Tuple[str, Awaitable[ValidationResult]]] = []
             if excel_path:
-                excel_result = await self._validate_excel(
-                    excel_path, 
-                    task.document_type
-                )
+                checks.append(("Excel file", self._validate_excel(
+                    excel_path, task.document_type, input_data.get("df_future")
+                )))
+            if template_path:
+                checks.append(("Template", self._validate_template(template_path)))
+            checks.extend(
+                (folder_key, asyncio.to_thread(self._validate_output_folder, folder_path, folder_key))
+                for folder_key, folder_path in folders
+            )
+            outcomes = await asyncio.gather(*(check for _, check in checks), return_exceptions=True)
+            
+            # A check that raised becomes an error for that check alone
+            check_results: List[ValidationResult] = []
+            for (label, _), outcome in zip(checks, outcomes):
+                if isinstance(outcome, BaseException):
+                    if not isinstance(outcome, Exception):
+                        raise outcome
+                    failed = ValidationResult(is_valid=True)
+                    failed.add_error(f"{label} check failed: {outcome}")
+                    self.log_error(failed.errors[0])
+                    outcome = failed
+                check_results.append(outcome)
+            results = iter(check_results)
+            
+            # Validate Excel file
+            if excel_path:
+                excel_result = next(results)
                 if not excel_result.is_valid:
                     validation_result.is_valid = False
                 validation_result.errors.extend(excel_result.errors)
@@ -111,23 +205,22 @@ class ValidationAgent(BaseAgent):
                 validation_result.validated_records = excel_result.validated_records
             
             # Validate template if provided
-            template_path = input_data.get("template_docx")
             if template_path:
-                template_result = await self._validate_template(template_path)
+                template_result = next(results)
                 if not template_result.is_valid:
                     validation_result.is_valid = False
                 validation_result.errors.extend(template_result.errors)
                 validation_result.warnings.extend(template_result.warnings)
             
             # Validate output folders
-            for folder_key in ["output_group_folder", "output_notice_folder", "merged_output_folder"]:
-                folder_path = input_data.get(folder_key)
-                if folder_path:
-                    folder_result = self._validate_output_folder(folder_path, folder_key)
-                    validation_result.warnings.extend(folder_result.warnings)
+            for folder_result in results:
+                if not folder_result.is_valid:
+                    validation_result.is_valid = False
+                validation_result.errors.extend(folder_result.errors)
+                validation_result.warnings.extend(folder_result.warnings)
             
             # Store result in task metadata
-            task.metadata["validation_result"] = validation_result.to_dict()
+            task.metadata.validation_result = validation_result.to_dict()
             
             if validation_result.is_valid:
                 task.mark_completed({"validation": validation_result.to_dict()})
@@ -152,14 +245,49 @@ class ValidationAgent(BaseAgent):
     async def _validate_excel(
         self, 
         excel_path: str, 
-        doc_type: DocumentType
+        doc_type: DocumentType,
+        df_future: Optional[Awaitable[pd.DataFrame]] = None
+    ) -> ValidationResult:
+        """
+        Validate the Excel file on a worker thread; see ``_validate_excel_sync``.
+        
+        Results are cached per (path, mtime, size, doc_type), so re-validating
+        an unchanged file skips the parse. In deep mode, a DataFrame already
+        being loaded by the caller (``df_future``) is reused instead of
+        reading the file again.
+        """
+        key = self._file_cache_key("excel", excel_path, doc_type)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        df = None
+        if self.deep_validation and df_future is not None:
+            try:
+                df = await df_future
+            except Exception:
+                df = None  # Read the file here so the failure is reported normally
+        
+        result = await asyncio.to_thread(self._validate_excel_sync, excel_path, doc_type, df)
+        self._cache_put(key, result)
+        return result
+    
+    def _validate_excel_sync(
+        self, 
+        excel_path: str, 
+        doc_type: DocumentType,
+        df: Optional[pd.DataFrame] = None
     ) -> ValidationResult:
         """
         Validate Excel file structure and content.
         
+        Blocking (file parsing); called off the event loop by ``_validate_excel``.
+        
         Args:
             excel_path: Path to Excel file
             doc_type: Document type to determine required columns
+            df: Already-loaded sheet with stripped column names, used
+                instead of reading ``excel_path`` in deep mode
             
         Returns:
             ValidationResult with errors and warnings
@@ -176,69 +304,184 @@ class ValidationAgent(BaseAgent):
             result.add_error(f"Invalid file format: {excel_path}. Expected .xls or .xlsx")
             return result
         
+        # Determine required columns and the validity column from the document type
+        required_cols, valid_col = self._TYPE_RULES.get(doc_type, self._DEFAULT_RULES)
+        
+        if not self.deep_validation:
+            try:
+                header_info = self._read_header_only(excel_path)
+            except Exception as e:
+                result.add_error(f"Failed to read Excel file: {str(e)}")
+                return result
+            
+            if header_info is not None:
+                header, row_count = header_info
+                result.total_records = row_count
+                result.validated_records = row_count
+                
+                header_cols = set(header)
+                missing_cols = {c for c in required_cols if c not in header_cols}
+                if missing_cols:
+                    result.add_error(f"Missing required columns: {missing_cols}")
+                
+                self.log_debug("Excel header check: %d rows, %d columns", row_count, len(header))
+                return result
+        
         try:
-            # Read Excel file
-            df = pd.read_excel(excel_path)
-            df.columns = df.columns.str.strip()
+            # Read Excel file unless the caller already loaded it
+            if df is None:
+                df = pd.read_excel(excel_path, engine=_EXCEL_ENGINE)
+                # Only rebuild the column index when some header has stray whitespace
+                if any(isinstance(c, str) and c != c.strip() for c in df.columns):
+                    df.columns = df.columns.str.strip()
             result.total_records = len(df)
             
-            # Determine required columns based on document type
-            if doc_type == DocumentType.OPEN_NEG_GROUP:
-                required_cols = self.REQUIRED_COLUMNS_GROUP
-            elif doc_type == DocumentType.OPEN_NEG_NOTICE:
-                required_cols = self.REQUIRED_COLUMNS_NOTICE
-            else:
-                # For general processing, require union of both
-                required_cols = self.REQUIRED_COLUMNS_GROUP.union(self.REQUIRED_COLUMNS_NOTICE)
-            
             # Check for missing columns
             actual_cols = set(df.columns)
-            missing_cols = required_cols - actual_cols
+            missing_cols = {c for c in required_cols if c not in actual_cols}
             if missing_cols:
                 result.add_error(f"Missing required columns: {missing_cols}")
             
+            # Null counts for every checked column in one pass over the block
+            checked_cols = [
+                c for c in ("ProvOrgNPI", "InsurancePlanName", valid_col)
+                if c in actual_cols
+            ]
+            null_counts = df[checked_cols].isna().sum()
+            
             # Data quality checks
-            if "ProvOrgNPI" in df.columns:
-                null_npi = df["ProvOrgNPI"].isna().sum()
+            if "ProvOrgNPI" in null_counts:
+                null_npi = int(null_counts["ProvOrgNPI"])
                 if null_npi > 0:
                     result.add_warning(f"{null_npi} rows with missing ProvOrgNPI")
             
-            if "InsurancePlanName" in df.columns:
-                null_plan = df["InsurancePlanName"].isna().sum()
+            if "InsurancePlanName" in null_counts:
+                null_plan = int(null_counts["InsurancePlanName"])
                 if null_plan > 0:
                     result.add_warning(f"{null_plan} rows with missing InsurancePlanName")
             
             # Check for OpenNegGroup or OpenNegNotice values
-            if doc_type == DocumentType.OPEN_NEG_GROUP and "OpenNegGroup" in df.columns:
-                valid_records = int(df["OpenNegGroup"].notna().sum())
-                result.validated_records = valid_records
-                if valid_records == 0:
-                    result.add_error("No valid OpenNegGroup values found")
-            elif doc_type == DocumentType.OPEN_NEG_NOTICE and "OpenNegNotice" in df.columns:
-                valid_records = int(df["OpenNegNotice"].notna().sum())
+            if valid_col in null_counts:
+                valid_records = result.total_records - int(null_counts[valid_col])
                 result.validated_records = valid_records
                 if valid_records == 0:
-                    result.add_error("No valid OpenNegNotice values found")
+                    result.add_error(f"No valid {valid_col} values found")
             else:
                 result.validated_records = result.total_records
             
+            # Row-level rules: 10-digit NPI, non-empty plan name, numeric offer
+            if {"ProvOrgNPI", "InsurancePlanName", "Offer"} <= actual_cols:
+                passed = _check_rows(
+                    pd.to_numeric(df["ProvOrgNPI"], errors="coerce").to_numpy(dtype=float),
+                    df["InsurancePlanName"].astype("string").str.strip().str.len().fillna(0).to_numpy(dtype=int),
+                    pd.to_numeric(
+                        df["Offer"].astype("string").str.replace(r"[$,\s]", "", regex=True),
+                        errors="coerce"
+                    ).to_numpy(dtype=float, na_value=np.nan),
+                )
+                invalid_rows = int(len(passed) - passed.sum())
+                if invalid_rows > 0:
+                    result.add_warning(
+                        f"{invalid_rows} rows fail row checks (10-digit NPI, plan name, numeric offer)"
+                    )
+            
             # Check for duplicates
             if "Claim Number" in df.columns:
                 duplicates = df["Claim Number"].duplicated().sum()
                 if duplicates > 0:
                     result.add_warning(f"{duplicates} duplicate claim numbers found")
             
-            self.log_debug(f"Excel validation: {result.total_records} rows, {len(df.columns)} columns")
+            self.log_debug("Excel validation: %d rows, %d columns", result.total_records, len(df.columns))
             
         except Exception as e:
             result.add_error(f"Failed to read Excel file: {str(e)}")
         
         return result
     
+    @staticmethod
+    def _read_header_only(excel_path: str) -> Optional[Tuple[List[str], int]]:
+        """
+        Read the stripped header row and data row count without parsing cells.
+        
+        Uses openpyxl's streaming read-only mode, which parses the first row
+        and takes the row count from the sheet dimensions.
+        
+        Args:
+            excel_path: Path to an .xlsx file
+            
+        Returns:
+            (header, data row count), or None when the file type is not
+            supported here (e.g. .xls) and a full read is needed
+        """
+        if not excel_path.lower().endswith('.xlsx'):
+            return None
+        
+        from openpyxl import load_workbook
+        
+        wb = load_workbook(excel_path, read_only=True, data_only=True)
+        try:
+            ws = wb.worksheets[0]
+            first_row = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+            header = [str(c).strip() for c in first_row if c is not None]
+            
+            max_row = ws.max_row
+            if max_row is None:
+                # No dimension record in the file; count rows by streaming
+                max_row = sum(1 for _ in ws.iter_rows(values_only=True))
+            return header, max(max_row - 1, 0)
+        finally:
+            wb.close()
+    
     async def _validate_template(self, template_path: str) -> ValidationResult:
+        """
+        Validate the Word template on a worker thread; see ``_validate_template_sync``.
+        
+        Results are cached per (path, mtime, size) like ``_validate_excel``.
+        """
+        key = self._file_cache_key("template", template_path)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        result = await asyncio.to_thread(self._validate_template_sync, template_path)
+        self._cache_put(key, result)
+        return result
+    
+    @staticmethod
+    def _file_cache_key(kind: str, path: str, *extra: Any) -> Optional[Tuple]:
+        """Build a result cache key from the file's identity, or None if it can't be stat'ed."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (kind, os.path.abspath(path), st.st_mtime_ns, st.st_size, *extra)
+    
+    def _cache_get(self, key: Optional[Tuple]) -> Optional[ValidationResult]:
+        """Return a copy of a cached result, refreshing its LRU position."""
+        if key is None or key not in self._result_cache:
+            return None
+        self._result_cache.move_to_end(key)
+        return copy.deepcopy(self._result_cache[key])
+    
+    def _cache_put(self, key: Optional[Tuple], result: ValidationResult) -> None:
+        """Store a copy of ``result``, evicting the least recently used entry."""
+        if key is None:
+            return
+        self._result_cache[key] = copy.deepcopy(result)
+        self._result_cache.move_to_end(key)
+        if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+    
+    def invalidate_cache(self) -> None:
+        """Drop all cached Excel/template validation results."""
+        self._result_cache.clear()
+    
+    def _validate_template_sync(self, template_path: str) -> ValidationResult:
         """
         Validate Word template file.
         
+        Blocking (document parsing); called off the event loop by ``_validate_template``.
+        
         Args:
             template_path: Path to Word template
             
@@ -258,29 +501,19 @@ class ValidationAgent(BaseAgent):
             return result
         
         try:
-            from docx import Document
-            
-            doc = Document(template_path)
-            
-            # Extract all text from document
-            all_text = ""
-            for paragraph in doc.paragraphs:
-                all_text += paragraph.text
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        all_text += cell.text
+            # Read the body XML straight from the .docx archive; no document tree needed
+            with zipfile.ZipFile(template_path) as archive:
+                xml = archive.read("word/document.xml").decode("utf-8", "ignore")
+            all_text = _XML_TAG.sub("", xml)
             
-            # Check for placeholders
-            missing_placeholders = []
-            for placeholder in self.TEMPLATE_PLACEHOLDERS:
-                if placeholder not in all_text:
-                    missing_placeholders.append(placeholder)
+            # Check for placeholders in a single pass over the text
+            found = set(self._PLACEHOLDER_PATTERN.findall(all_text))
+            missing_placeholders = [p for p in self.TEMPLATE_PLACEHOLDERS if p not in found]
             
             if missing_placeholders:
                 result.add_warning(f"Missing template placeholders: {missing_placeholders}")
             
-            self.log_debug(f"Template validation complete: {len(missing_placeholders)} missing placeholders")
+            self.log_debug("Template validation complete: %d missing placeholders", len(missing_placeholders))
             
         except Exception as e:
             result.add_error(f"Failed to read template file: {str(e)}")
@@ -300,18 +533,27 @@ class ValidationAgent(BaseAgent):
         """
         result = ValidationResult(is_valid=True)
         
-        if os.path.exists(folder_path):
-            # Check if folder is writable
-            if not os.access(folder_path, os.W_OK):
-                result.add_warning(f"Output folder {folder_name} may not be writable: {folder_path}")
-            
-            # Check for existing files
-            existing_files = len([f for f in os.listdir(folder_path) if os.path.isfile(os.path.join(folder_path, f))])
-            if existing_files > 0:
-                result.add_warning(f"Output folder {folder_name} contains {existing_files} existing files")
-        else:
+        # One stat covers existence, type and the common writable case
+        try:
+            st = os.stat(folder_path)
+        except FileNotFoundError:
             # Folder will be created during processing
-            self.log_debug(f"Output folder {folder_name} will be created: {folder_path}")
+            self.log_debug("Output folder %s will be created: %s", folder_name, folder_path)
+            return result
+        
+        if not stat.S_ISDIR(st.st_mode):
+            result.add_warning(f"Output folder {folder_name} is not a directory: {folder_path}")
+            return result
+        
+        # Only fall back to access() when the owner write bit is clear
+        if not (st.st_mode & stat.S_IWUSR) and not os.access(folder_path, os.W_OK):
+            result.add_warning(f"Output folder {folder_name} may not be writable: {folder_path}")
+        
+        # Check for existing files
+        with os.scandir(folder_path) as entries:
+            existing_files = sum(1 for entry in entries if entry.is_file())
+        if existing_files > 0:
+            result.add_warning(f"Output folder {folder_name} contains {existing_files} existing files")
         
         return result
     
@@ -342,4 +584,4 @@ class ValidationAgent(BaseAgent):
         )
         
         result_task = await self.execute(task)
-        return ValidationResult(**result_task.metadata.get("validation_result", {"is_valid": False}))
+        return ValidationResult(**(result_task.metadata.validation_result or {"is_valid": False}))
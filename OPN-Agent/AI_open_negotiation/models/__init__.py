@@ -3,13 +3,14 @@ Models module for the Document Agent System.
 Contains dataclasses for tasks, results, and processing status.
 """
 
-from .task_models import TaskStatus, DocumentType, DocumentTask
+from .task_models import TaskStatus, DocumentType, DocumentTask, TaskMetadata
 from .result_models import ValidationResult, GenerationStats, ProcessingResult
 
 __all__ = [
     "TaskStatus",
     "DocumentType", 
     "DocumentTask",
+    "TaskMetadata",
     "ValidationResult",
     "GenerationStats",
     "ProcessingResult",
@@ -5,12 +5,14 @@ Contains dataclasses for validation results, generation statistics,
 and processing outcomes with comprehensive error tracking.
 """
 
+import importlib.util
+import json
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationResult:
     """
     Result of data validation operations.
@@ -57,7 +59,7 @@ class ValidationResult:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class GenerationStats:
     """
     Statistics for document generation operations.
@@ -128,21 +130,43 @@ class GenerationStats:
             errors=self.errors + other.errors,
         )
     
+    def merge_inplace(self, other: "GenerationStats") -> "GenerationStats":
+        """Add another GenerationStats into this one, extending its lists; returns self."""
+        self.total_records += other.total_records
+        self.successful += other.successful
+        self.failed += other.failed
+        self.skipped += other.skipped
+        self.duration_seconds += other.duration_seconds
+        self.output_files.extend(other.output_files)
+        self.errors.extend(other.errors)
+        return self
+    
+    @classmethod
+    def merge_many(cls, stats_iter: Iterable["GenerationStats"]) -> "GenerationStats":
+        """Merge any number of GenerationStats into one new instance in a single pass."""
+        merged = cls()
+        for stats in stats_iter:
+            merged.merge_inplace(stats)
+        return merged
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert stats to dictionary for serialization."""
+        # success_rate inlined to skip the property call
+        total = self.total_records
+        successful = self.successful
         return {
-            "total_records": self.total_records,
-            "successful": self.successful,
+            "total_records": total,
+            "successful": successful,
             "failed": self.failed,
             "skipped": self.skipped,
-            "success_rate": round(self.success_rate, 2),
+            "success_rate": round((successful / total) * 100, 2) if total else 0.0,
             "duration_seconds": round(self.duration_seconds, 2),
             "output_files_count": len(self.output_files),
             "errors": self.errors,
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingResult:
     """
     Final result of document processing pipeline.
@@ -172,33 +196,91 @@ class ProcessingResult:
     warnings: List[str] = field(default_factory=list)
     started_at: datetime = field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
+    _duration_seconds: float = field(default=0.0, init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        if self.completed_at is not None:
+            self._duration_seconds = (self.completed_at - self.started_at).total_seconds()
     
     @property
     def duration_seconds(self) -> float:
-        """Calculate total processing duration in seconds."""
-        if self.completed_at is None:
-            return 0.0
-        return (self.completed_at - self.started_at).total_seconds()
+        """Total processing duration in seconds, fixed when the result is marked completed."""
+        return self._duration_seconds if self.completed_at is not None else 0.0
     
     def mark_completed(self, status: str = "SUCCESS") -> None:
         """Mark processing as completed with timestamp."""
         self.status = status
         self.completed_at = datetime.now()
+        self._duration_seconds = (self.completed_at - self.started_at).total_seconds()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert result to dictionary for API response."""
+        stats = self.stats
+        validation = self.validation_result
+        duration = round(self._duration_seconds, 2) if self.completed_at is not None else 0.0
+        
+        # "stats" and "validation" are only present when set
+        if stats and validation:
+            return {
+                "status": self.status,
+                "output_folder": self.output_folder,
+                "duration_seconds": duration,
+                "errors": self.errors,
+                "warnings": self.warnings,
+                "stats": stats.to_dict(),
+                "validation": validation.to_dict(),
+            }
+        
         result = {
             "status": self.status,
             "output_folder": self.output_folder,
-            "duration_seconds": round(self.duration_seconds, 2),
+            "duration_seconds": duration,
             "errors": self.errors,
             "warnings": self.warnings,
         }
+        if stats:
+            result["stats"] = stats.to_dict()
+        elif validation:
+            result["validation"] = validation.to_dict()
+        return result
+    
+    def to_json_bytes(self, extra: Optional[Dict[str, Any]] = None) -> bytes:
+        """
+        Serialize ``to_dict()`` straight to UTF-8 JSON for HTTP responses.
         
-        if self.stats:
-            result["stats"] = self.stats.to_dict()
-        
-        if self.validation_result:
-            result["validation"] = self.validation_result.to_dict()
+        Uses orjson or msgspec when installed, otherwise the standard json module.
         
-        return result
+        Args:
+            extra: Fields to put ahead of the result fields (e.g. request_id)
+            
+        Returns:
+            JSON document as bytes
+        """
+        payload = {**extra, **self.to_dict()} if extra else self.to_dict()
+        return _encode_json(payload)
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback JSON conversion for numpy scalars and other stray values."""
+    if hasattr(obj, "item"):
+        return obj.item()
+    return str(obj)
+
+
+# Pick the fastest installed JSON encoder once at import: orjson, then msgspec,
+# then the standard library
+if importlib.util.find_spec("orjson"):
+    import orjson
+    
+    def _encode_json(payload: Any) -> bytes:
+        return orjson.dumps(payload, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+elif importlib.util.find_spec("msgspec"):
+    import msgspec
+    
+    _MSGSPEC_ENCODER = msgspec.json.Encoder(enc_hook=_json_default)
+    
+    def _encode_json(payload: Any) -> bytes:
+        return _MSGSPEC_ENCODER.encode(payload)
+else:
+    def _encode_json(payload: Any) -> bytes:
+        return json.dumps(payload, default=_json_default).encode("utf-8")
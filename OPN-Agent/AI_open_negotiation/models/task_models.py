@@ -5,10 +5,17 @@ Contains dataclasses and enums for managing document processing tasks
 with comprehensive status tracking and metadata support.
 """
 
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+# Wall-clock/monotonic pair captured once, used to turn monotonic
+# timestamps back into datetimes when a task is serialized
+_BASE_WALL = time.time()
+_BASE_MONO_NS = time.monotonic_ns()
 
 
 class TaskStatus(Enum):
@@ -29,7 +36,90 @@ class DocumentType(Enum):
     MERGED_OUTPUT = "merged_output"
 
 
-@dataclass
+@dataclass(slots=True)
+class TaskMetadata:
+    """
+    Task metadata with typed slots for the entries the agents write.
+    
+    The agents set ``stats``, ``validation_result`` and ``result`` as
+    attributes; anything else goes in ``extra``. Dict-style access
+    (``metadata["stats"]``, ``metadata.get(...)``) still works and covers
+    both, with unset slots treated as missing keys. It is a plain class
+    rather than a ``collections.abc.MutableMapping`` so the hot path pays no
+    ABC overhead; only the dict methods the code needs are provided.
+    
+    Attributes:
+        stats: Generation statistics dict from a generation agent
+        validation_result: Validation result dict from the validation agent
+        result: Processing result dict from the orchestrator
+        extra: Any other metadata entries
+    """
+    stats: Optional[Dict[str, Any]] = None
+    validation_result: Optional[Dict[str, Any]] = None
+    result: Optional[Dict[str, Any]] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+    
+    _SLOT_KEYS = frozenset({"stats", "validation_result", "result"})
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self._SLOT_KEYS:
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        return self.extra[key]
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._SLOT_KEYS:
+            setattr(self, key, value)
+        else:
+            self.extra[key] = value
+    
+    def __delitem__(self, key: str) -> None:
+        if key in self._SLOT_KEYS:
+            if getattr(self, key) is None:
+                raise KeyError(key)
+            setattr(self, key, None)
+        else:
+            del self.extra[key]
+    
+    def __contains__(self, key: object) -> bool:
+        if key in self._SLOT_KEYS:
+            return getattr(self, key) is not None
+        return key in self.extra
+    
+    def __iter__(self) -> Iterator[str]:
+        for key in ("stats", "validation_result", "result"):
+            if getattr(self, key) is not None:
+                yield key
+        yield from self.extra
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the entry for ``key``, or ``default`` if it is unset."""
+        if key in self._SLOT_KEYS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return self.extra.get(key, default)
+    
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Iterate over (key, value) pairs of the set entries."""
+        for key in self:
+            yield key, self[key]
+    
+    def update(self, other: Dict[str, Any]) -> None:
+        """Set several entries at once."""
+        for key, value in other.items():
+            self[key] = value
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert metadata to a plain dictionary for serialization."""
+        return dict(self.items())
+
+
+@dataclass(slots=True)
 class DocumentTask:
     """
     Represents a document processing task with full lifecycle tracking.
@@ -44,7 +134,8 @@ class DocumentTask:
         metadata: Additional task metadata and results
         error_message: Error details if task failed
         created_at: Timestamp when task was created
-        updated_at: Timestamp of last status update
+        updated_at_ns: Monotonic timestamp (ns) of last status update;
+            ``updated_at`` gives it as a datetime
         
     Example:
         >>> task = DocumentTask(
@@ -61,36 +152,41 @@ class DocumentTask:
     status: TaskStatus = TaskStatus.PENDING
     retry_count: int = 0
     max_retries: int = 3
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    metadata: TaskMetadata = field(default_factory=TaskMetadata)
     error_message: Optional[str] = None
     created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
+    updated_at_ns: int = field(default_factory=time.monotonic_ns)
+    
+    @property
+    def updated_at(self) -> datetime:
+        """Timestamp of last status update."""
+        return datetime.fromtimestamp(_BASE_WALL + (self.updated_at_ns - _BASE_MONO_NS) / 1e9)
     
     def mark_in_progress(self) -> None:
         """Mark task as in progress."""
         self.status = TaskStatus.IN_PROGRESS
-        self.updated_at = datetime.now()
+        self.updated_at_ns = time.monotonic_ns()
     
     def mark_completed(self, stats: Optional[Dict[str, Any]] = None) -> None:
         """Mark task as completed with optional statistics."""
         self.status = TaskStatus.COMPLETED
-        self.updated_at = datetime.now()
+        self.updated_at_ns = time.monotonic_ns()
         if stats:
-            self.metadata["stats"] = stats
+            self.metadata.stats = stats
     
     def mark_failed(self, error: str) -> None:
         """Mark task as failed with error message."""
         self.status = TaskStatus.FAILED
         self.error_message = error
-        self.updated_at = datetime.now()
+        self.updated_at_ns = time.monotonic_ns()
     
     def mark_partial_failure(self, error: str, stats: Optional[Dict[str, Any]] = None) -> None:
         """Mark task as partially failed with error and partial results."""
         self.status = TaskStatus.PARTIAL_FAILURE
         self.error_message = error
-        self.updated_at = datetime.now()
+        self.updated_at_ns = time.monotonic_ns()
         if stats:
-            self.metadata["stats"] = stats
+            self.metadata.stats = stats
     
     def can_retry(self) -> bool:
         """Check if task can be retried based on retry count."""
@@ -100,7 +196,7 @@ class DocumentTask:
         """Increment retry counter and reset status to pending."""
         self.retry_count += 1
         self.status = TaskStatus.PENDING
-        self.updated_at = datetime.now()
+        self.updated_at_ns = time.monotonic_ns()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert task to dictionary for serialization."""
@@ -110,7 +206,7 @@ class DocumentTask:
             "status": self.status.value,
             "retry_count": self.retry_count,
             "max_retries": self.max_retries,
-            "metadata": self.metadata,
+            "metadata": self.metadata.to_dict(),
             "error_message": self.error_message,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
@@ -5,17 +5,37 @@ Provides AI-powered document processing with natural language
 analysis, intelligent error recovery, and interactive mode.
 """
 
+import asyncio
+import copy
+import hashlib
+import importlib.util
+import inspect
 import json
 import os
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Sequence, Union
 
-from semantic_kernel import Kernel
-from semantic_kernel.connectors.ai.open_ai import OpenAIChatCompletion
-from semantic_kernel.connectors.ai.function_choice_behavior import FunctionChoiceBehavior
-from semantic_kernel.contents.chat_history import ChatHistory
+import numpy as np
 
-from AI_open_negotiation.plugins.document_plugin import AdvancedDocumentPlugin
-from AI_open_negotiation.agents.document_agent.orchestrator_agent import OrchestratorAgent
+# orjson encodes prompt summaries and printed results faster than the json
+# module when installed
+_HAS_ORJSON = importlib.util.find_spec("orjson") is not None
+
+
+def _pretty_json(data: Any) -> str:
+    """Indented JSON text for console output."""
+    if _HAS_ORJSON:
+        import orjson
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(data, indent=2)
+
+
+# Semantic Kernel (and the plugin built on it) pulls in openai, httpx, pydantic
+# etc.; it is imported when an orchestrator is created, not with this module
+if TYPE_CHECKING:
+    from semantic_kernel import Kernel
+    from semantic_kernel.connectors.ai.open_ai import OpenAIChatCompletion
+    from AI_open_negotiation.plugins.document_plugin import AdvancedDocumentPlugin
 
 
 class AIDocumentOrchestrator:
@@ -61,11 +81,23 @@ Available functions:
 - analyze_data: Get insights about the data
 - get_processing_status: Check last processing result"""
     
+    # Cached insight answers kept per orchestrator, and the cosine similarity
+    # above which a near-duplicate prompt reuses a cached answer
+    INSIGHTS_CACHE_SIZE = 128
+    INSIGHTS_SIMILARITY_THRESHOLD = 0.85
+    
+    # Data analyses kept per orchestrator, keyed by the Excel file's identity
+    ANALYSIS_CACHE_SIZE = 32
+    
+    # Longest JSON summary of analysis/stats embedded in an insight prompt
+    INSIGHT_SUMMARY_MAX_CHARS = 4000
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
         model_id: str = "gpt-4o-mini",
-        config: Optional[Dict[str, Any]] = None
+        config: Optional[Dict[str, Any]] = None,
+        embedding_fn: Optional[Callable[[str], Union[Sequence[float], Awaitable[Sequence[float]]]]] = None
     ):
         """
         Initialize the AI orchestrator.
@@ -74,21 +106,48 @@ Available functions:
             api_key: OpenAI API key (or from environment)
             model_id: AI model to use
             config: Configuration for agents
+            embedding_fn: Optional prompt -> embedding vector function (sync or async);
+                enables reuse of cached insights for near-duplicate prompts
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.model_id = model_id
         self.config = config or {}
+        self.embedding_fn = embedding_fn
+        
+        # Insight answers by prompt hash (LRU), plus unit-length prompt embeddings
+        # for the similarity tier when embedding_fn is set
+        self._insights_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._insights_embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        
+        # analyze_data results by (path, mtime_ns, size), LRU
+        self._analysis_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        
+        # Chat service and its settings class, set by _create_kernel when an API key is present
+        self._chat_service: Optional["OpenAIChatCompletion"] = None
+        self._settings_cls: Optional[type] = None
+        
+        from semantic_kernel.contents.chat_history import ChatHistory
+        from AI_open_negotiation.agents.document_agent.base_agent import get_agent_logger
+        from AI_open_negotiation.plugins.document_plugin import AdvancedDocumentPlugin
+        
+        # Progress goes through the agents' queued log handler rather than
+        # print(), so parallel batch items don't contend on stdout
+        self.logger = get_agent_logger("AIOrchestrator", self.config.get("log_level", "INFO"))
         
         # Initialize kernel and plugin
         self.kernel = self._create_kernel()
         self.plugin = AdvancedDocumentPlugin(self.kernel, self.config)
         self.kernel.add_plugin(self.plugin, "DocumentPlugin")
         
-        # Initialize chat history
+        # Initialize chat history; insight queries use empty histories of the same class
         self.chat_history = ChatHistory(system_message=self.SYSTEM_PROMPT)
+        self._chat_history_cls = ChatHistory
     
-    def _create_kernel(self) -> Kernel:
+    def _create_kernel(self) -> "Kernel":
         """Create and configure Semantic Kernel."""
+        from semantic_kernel import Kernel
+        from semantic_kernel.connectors.ai.open_ai import OpenAIChatCompletion
+        
         kernel = Kernel()
         
         if self.api_key:
@@ -98,6 +157,8 @@ Available functions:
                 api_key=self.api_key,
             )
             kernel.add_service(chat_service)
+            self._chat_service = chat_service
+            self._settings_cls = chat_service.get_prompt_execution_settings_class()
         
         return kernel
     
@@ -106,7 +167,8 @@ Available functions:
         excel_path: str,
         template_docx: str,
         output_folder: str,
-        user_instructions: Optional[str] = None
+        user_instructions: Optional[str] = None,
+        plugin: Optional["AdvancedDocumentPlugin"] = None
     ) -> Dict[str, Any]:
         """
         Process documents with AI analysis and guidance.
@@ -122,10 +184,13 @@ Available functions:
             template_docx: Path to Word template
             output_folder: Base output folder
             user_instructions: Optional additional instructions
+            plugin: Plugin to run on (default ``self.plugin``); parallel batches
+                pass a per-worker instance
             
         Returns:
             Dictionary with processing result and AI insights
         """
+        plugin = plugin or self.plugin
         result = {
             "status": "PENDING",
             "analysis": None,
@@ -137,9 +202,8 @@ Available functions:
         
         try:
             # Step 1: Analyze data
-            print("[AI] Analyzing input data...")
-            analysis_result = await self.plugin.analyze_data(excel_path)
-            result["analysis"] = json.loads(analysis_result)
+            self.logger.info("Analyzing input data: %s", excel_path)
+            result["analysis"] = await self._analyze_cached(excel_path, plugin)
             
             if "error" in result["analysis"]:
                 result["status"] = "FAILED"
@@ -147,9 +211,8 @@ Available functions:
                 return result
             
             # Step 2: Validate data
-            print("[AI] Validating data quality...")
-            validation_result = await self.plugin.validate_data(excel_path, template_docx)
-            result["validation"] = json.loads(validation_result)
+            self.logger.info("Validating data quality: %s", excel_path)
+            result["validation"] = await plugin.validate_data_obj(excel_path, template_docx)
             
             if not result["validation"].get("is_valid", False):
                 result["status"] = "VALIDATION_FAILED"
@@ -166,24 +229,26 @@ Available functions:
                 return result
             
             # Step 3: Process documents
-            print("[AI] Generating documents...")
+            self.logger.info("Generating documents into %s", output_folder)
             if user_instructions:
-                print(f"[AI] User instructions: {user_instructions}")
+                self.logger.info("User instructions: %s", user_instructions)
             
-            processing_result = await self.plugin.create_documents(
+            result["processing"] = await plugin.create_documents_obj(
                 excel_path=excel_path,
                 template_docx=template_docx,
                 output_folder=output_folder,
             )
-            result["processing"] = json.loads(processing_result)
             result["status"] = result["processing"].get("status", "UNKNOWN")
             
             # Step 4: Get AI insights
             if self.api_key and result["status"] == "SUCCESS":
+                summary = self._compact_summary({
+                    "analysis": result["analysis"],
+                    "stats": result["processing"].get("stats"),
+                })
                 insights = await self._get_ai_insights(
                     f"Document processing completed successfully. "
-                    f"Analysis: {result['analysis']}. "
-                    f"Stats: {result['processing'].get('stats')}. "
+                    f"Results: {summary}. "
                     f"Provide a brief summary and any recommendations."
                 )
                 result["insights"] = insights
@@ -195,6 +260,48 @@ Available functions:
             result["errors"].append(str(e))
             return result
     
+    def _compact_summary(self, data: Dict[str, Any]) -> str:
+        """Encode ``data`` as compact JSON for a prompt, capped at INSIGHT_SUMMARY_MAX_CHARS."""
+        if _HAS_ORJSON:
+            import orjson
+            text = orjson.dumps(data, default=str).decode("utf-8")
+        else:
+            text = json.dumps(data, separators=(",", ":"), default=str)
+        
+        if len(text) > self.INSIGHT_SUMMARY_MAX_CHARS:
+            text = text[:self.INSIGHT_SUMMARY_MAX_CHARS] + "...(truncated)"
+        return text
+    
+    async def _analyze_cached(self, excel_path: str, plugin: "AdvancedDocumentPlugin") -> Dict[str, Any]:
+        """
+        Analyze an Excel file, reusing the result while the file is unchanged.
+        
+        Args:
+            excel_path: Path to Excel file
+            plugin: Plugin that runs the analysis on a cache miss
+            
+        Returns:
+            Analysis dictionary (a copy; safe to modify)
+        """
+        try:
+            st = os.stat(excel_path)
+        except OSError:
+            # Missing/unreadable file: let the plugin report it
+            return await plugin.analyze_data_obj(excel_path)
+        
+        key = (os.path.abspath(excel_path), st.st_mtime_ns, st.st_size)
+        cached = self._analysis_cache.get(key)
+        if cached is not None:
+            self._analysis_cache.move_to_end(key)
+            return copy.deepcopy(cached)
+        
+        analysis = await plugin.analyze_data_obj(excel_path)
+        if "error" not in analysis:
+            self._analysis_cache[key] = copy.deepcopy(analysis)
+            if len(self._analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+        return analysis
+    
     async def _get_ai_insights(self, prompt: str) -> Optional[str]:
         """
         Get AI insights using the chat service.
@@ -205,33 +312,98 @@ Available functions:
         Returns:
             AI response text or None if unavailable
         """
-        if not self.api_key:
+        if self._chat_service is None:
             return None
         
+        key = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+        cached = self._insights_cache.get(key)
+        if cached is not None:
+            self._insights_cache.move_to_end(key)
+            return cached
+        
+        embedding = None
+        if self.embedding_fn is not None:
+            embedding = await self._embed_prompt(prompt)
+            cached = self._similar_insight(embedding)
+            if cached is not None:
+                return cached
+        
         try:
-            chat_service = self.kernel.get_service("chat")
-            
             # Get execution settings
-            settings = chat_service.get_prompt_execution_settings_class()(
+            settings = self._settings_cls(
                 max_tokens=500,
                 temperature=0.7,
             )
             
-            # Create temporary history for this query
-            temp_history = ChatHistory()
-            temp_history.add_user_message(prompt)
-            
-            response = await chat_service.get_chat_message_content(
-                chat_history=temp_history,
-                settings=settings,
-                kernel=self.kernel,
-            )
+            if hasattr(self._chat_service, "get_text_content"):
+                # Single-shot prompt; no history object needed
+                response = await self._chat_service.get_text_content(prompt, settings=settings)
+                insight = response.text if response else None
+            else:
+                # Create temporary history for this query. A fresh one each time:
+                # copying a shared template would share its message list
+                temp_history = self._chat_history_cls()
+                temp_history.add_user_message(prompt)
+                
+                response = await self._chat_service.get_chat_message_content(
+                    chat_history=temp_history,
+                    settings=settings,
+                    kernel=self.kernel,
+                )
+                insight = response.content if response else None
+            if not insight:
+                return None
             
-            return str(response) if response else None
+            self._cache_insight(key, insight, embedding)
+            return insight
             
         except Exception as e:
-            print(f"[AI] Insights error: {e}")
+            self.logger.warning("Insights error: %s", e)
+            return None
+    
+    async def _embed_prompt(self, prompt: str) -> Optional[np.ndarray]:
+        """Embed a prompt as a unit vector, or None if embedding fails."""
+        try:
+            vector = self.embedding_fn(prompt)
+            if inspect.isawaitable(vector):
+                vector = await vector
+            vector = np.asarray(vector, dtype=np.float32).ravel()
+        except Exception as e:
+            self.logger.warning("Embedding error: %s", e)
             return None
+        
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+    
+    def _similar_insight(self, embedding: Optional[np.ndarray]) -> Optional[str]:
+        """Return the cached insight whose prompt is most similar, if above the threshold."""
+        if embedding is None or not self._insights_embeddings:
+            return None
+        
+        keys = list(self._insights_embeddings)
+        vectors = list(self._insights_embeddings.values())
+        if any(v.shape != embedding.shape for v in vectors):
+            return None
+        
+        # All embeddings are unit length, so one matmul gives every cosine similarity
+        similarities = np.stack(vectors) @ embedding
+        best = int(similarities.argmax())
+        if similarities[best] <= self.INSIGHTS_SIMILARITY_THRESHOLD:
+            return None
+        
+        self._insights_cache.move_to_end(keys[best])
+        return self._insights_cache[keys[best]]
+    
+    def _cache_insight(self, key: str, insight: str, embedding: Optional[np.ndarray]) -> None:
+        """Store an insight, evicting the least recently used entry."""
+        self._insights_cache[key] = insight
+        self._insights_cache.move_to_end(key)
+        if embedding is not None:
+            self._insights_embeddings[key] = embedding
+        
+        if len(self._insights_cache) > self.INSIGHTS_CACHE_SIZE:
+            evicted, _ = self._insights_cache.popitem(last=False)
+            self._insights_embeddings.pop(evicted, None)
     
     async def interactive_document_generation(self) -> None:
         """
@@ -253,112 +425,175 @@ Available functions:
         print("\nOr just tell me what you need in natural language!")
         print("-" * 60)
         
-        excel_path = None
-        template_path = None
-        output_folder = "output"
+        session = {"excel_path": None, "template_path": None, "output_folder": "output"}
+        
+        # Quick commands: "<command> <path>" and bare "<command>".
+        # Handlers return True to leave the loop.
+        path_commands = {
+            "analyze": self._cmd_analyze,
+            "validate": self._cmd_validate,
+        }
+        bare_commands = {
+            "status": self._cmd_status,
+            "process": self._cmd_process,
+            "quit": self._cmd_quit,
+        }
         
         while True:
             try:
-                user_input = input("\n👤 You: ").strip()
+                user_input = (await self._read_input("\n👤 You: ")).strip()
                 
                 if not user_input:
                     continue
                 
-                if user_input.lower() == 'quit':
-                    print("\n👋 Goodbye!")
-                    break
-                
                 # Handle quick commands
-                if user_input.lower().startswith('analyze '):
-                    path = user_input[8:].strip()
-                    result = await self.plugin.analyze_data(path)
-                    print(f"\n🤖 Assistant:\n{result}")
-                    excel_path = path
-                    continue
-                
-                if user_input.lower().startswith('validate '):
-                    path = user_input[9:].strip()
-                    result = await self.plugin.validate_data(path, template_path)
-                    print(f"\n🤖 Assistant:\n{result}")
-                    excel_path = path
-                    continue
-                
-                if user_input.lower() == 'status':
-                    result = self.plugin.get_processing_status()
-                    print(f"\n🤖 Assistant:\n{result}")
-                    continue
-                
-                if user_input.lower() == 'process':
-                    if not excel_path:
-                        print("\n🤖 Assistant: Please provide an Excel path first using 'analyze <path>'")
-                        continue
-                    if not template_path:
-                        template_path = input("📄 Template path: ").strip()
-                    
-                    print("\n🤖 Assistant: Starting document processing...")
-                    result = await self.process_with_ai_guidance(
-                        excel_path=excel_path,
-                        template_docx=template_path,
-                        output_folder=output_folder,
-                    )
-                    print(f"\n{json.dumps(result, indent=2)}")
+                command, _, arg = user_input.partition(" ")
+                arg = arg.strip()
+                handler = (path_commands if arg else bare_commands).get(command.lower())
+                if handler is not None:
+                    if await handler(arg, session):
+                        break
                     continue
                 
                 # Use AI for natural language processing
-                if self.api_key:
+                if self._chat_service is not None:
+                    from semantic_kernel.connectors.ai.function_choice_behavior import FunctionChoiceBehavior
+                    
                     self.chat_history.add_user_message(user_input)
                     
-                    chat_service = self.kernel.get_service("chat")
-                    settings = chat_service.get_prompt_execution_settings_class()(
+                    settings = self._settings_cls(
                         max_tokens=1000,
                         temperature=0.7,
                         function_choice_behavior=FunctionChoiceBehavior.Auto(),
                     )
                     
-                    response = await chat_service.get_chat_message_content(
+                    response = await self._chat_service.get_chat_message_content(
                         chat_history=self.chat_history,
                         settings=settings,
                         kernel=self.kernel,
                     )
                     
-                    print(f"\n🤖 Assistant: {response}")
-                    self.chat_history.add_assistant_message(str(response))
+                    reply = response.content or ""
+                    print(f"\n🤖 Assistant: {reply}")
+                    self.chat_history.add_assistant_message(reply)
                 else:
                     print("\n🤖 Assistant: AI features require an API key. Use commands instead.")
                     
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, EOFError):
                 print("\n\n👋 Interrupted. Goodbye!")
                 break
             except Exception as e:
                 print(f"\n❌ Error: {e}")
     
+    @staticmethod
+    async def _read_input(prompt: str) -> str:
+        """
+        Read a line from stdin in a worker thread so the event loop keeps running.
+        
+        ``input()`` can't be interrupted, so a pending read holds up shutdown
+        (e.g. after Ctrl-C) until the user presses Enter.
+        """
+        return await asyncio.to_thread(input, prompt)
+    
+    async def _cmd_analyze(self, path: str, session: Dict[str, Any]) -> bool:
+        """Interactive 'analyze <path>' command."""
+        result = await self.plugin.analyze_data(path)
+        print(f"\n🤖 Assistant:\n{result}")
+        session["excel_path"] = path
+        return False
+    
+    async def _cmd_validate(self, path: str, session: Dict[str, Any]) -> bool:
+        """Interactive 'validate <path>' command."""
+        result = await self.plugin.validate_data(path, session["template_path"])
+        print(f"\n🤖 Assistant:\n{result}")
+        session["excel_path"] = path
+        return False
+    
+    async def _cmd_status(self, _: str, session: Dict[str, Any]) -> bool:
+        """Interactive 'status' command."""
+        result = self.plugin.get_processing_status()
+        print(f"\n🤖 Assistant:\n{result}")
+        return False
+    
+    async def _cmd_process(self, _: str, session: Dict[str, Any]) -> bool:
+        """Interactive 'process' command."""
+        if not session["excel_path"]:
+            print("\n🤖 Assistant: Please provide an Excel path first using 'analyze <path>'")
+            return False
+        if not session["template_path"]:
+            session["template_path"] = (await self._read_input("📄 Template path: ")).strip()
+        
+        print("\n🤖 Assistant: Starting document processing...")
+        result = await self.process_with_ai_guidance(
+            excel_path=session["excel_path"],
+            template_docx=session["template_path"],
+            output_folder=session["output_folder"],
+        )
+        print(f"\n{_pretty_json(result)}")
+        return False
+    
+    async def _cmd_quit(self, _: str, session: Dict[str, Any]) -> bool:
+        """Interactive 'quit' command."""
+        print("\n👋 Goodbye!")
+        return True
+    
+    def _clone_plugin_for_worker(self) -> "AdvancedDocumentPlugin":
+        """
+        Build a plugin for one batch worker.
+        
+        Shares the kernel and config but has its own orchestrator, validator
+        and last-result state, so parallel workers don't race on them. The
+        clone is not registered with the kernel.
+        """
+        return type(self.plugin)(self.kernel, self.config)
+    
     async def process_batch(
         self,
         configurations: List[Dict[str, str]],
-        parallel: bool = False
+        parallel: bool = False,
+        max_concurrency: int = 8
     ) -> List[Dict[str, Any]]:
         """
         Process multiple document configurations.
         
+        Parallel batches run each worker on its own plugin clone, so
+        ``self.plugin.get_processing_status()`` only reflects sequential runs.
+        
         Args:
             configurations: List of config dicts with excel_path, template_docx, output_folder
             parallel: Whether to process in parallel
+            max_concurrency: Most configurations processed at once when parallel
             
         Returns:
             List of processing results
         """
-        import asyncio
-        
-        async def process_one(config: Dict[str, str]) -> Dict[str, Any]:
+        async def process_one(
+            config: Dict[str, str],
+            plugin: Optional["AdvancedDocumentPlugin"] = None
+        ) -> Dict[str, Any]:
             return await self.process_with_ai_guidance(
                 excel_path=config["excel_path"],
                 template_docx=config["template_docx"],
                 output_folder=config["output_folder"],
+                plugin=plugin,
             )
         
         if parallel:
+            # One plugin per worker slot; taking one from the pool also bounds
+            # concurrent LLM calls and Excel reads
+            pool: "asyncio.Queue[AdvancedDocumentPlugin]" = asyncio.Queue()
+            for _ in range(min(max(1, max_concurrency), len(configurations))):
+                pool.put_nowait(self._clone_plugin_for_worker())
+            
+            async def guarded(config: Dict[str, str]) -> Dict[str, Any]:
+                plugin = await pool.get()
+                try:
+                    return await process_one(config, plugin)
+                finally:
+                    pool.put_nowait(plugin)
+            
             results = await asyncio.gather(
-                *[process_one(config) for config in configurations],
+                *[guarded(config) for config in configurations],
                 return_exceptions=True
             )
             return [
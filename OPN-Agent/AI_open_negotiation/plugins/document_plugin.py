@@ -18,6 +18,7 @@ from typing import Annotated, Any, Dict, Optional
 from semantic_kernel import Kernel
 from semantic_kernel.functions import kernel_function
 
+from AI_open_negotiation.agents.document_agent.io_utils import load_excel_cached
 from AI_open_negotiation.agents.document_agent.orchestrator_agent import OrchestratorAgent
 from AI_open_negotiation.agents.document_agent.validation_agent import ValidationAgent
 from AI_open_negotiation.models.task_models import DocumentTask, DocumentType
@@ -127,19 +128,10 @@ class AdvancedDocumentPlugin:
             - stats: Generation statistics
             - errors: List of error messages
         """
-        document_config = {
-            "excel_path": excel_path,
-            "template_docx": template_docx,
-            "output_group_folder": f"{output_folder}/groups",
-            "output_notice_folder": f"{output_folder}/notices",
-            "merged_output_folder": f"{output_folder}/merged",
-        }
-        
-        result = await self.orchestrator.process_document_request(document_config)
-        self._last_result = result
+        result = await self.create_documents_obj(excel_path, template_docx, output_folder)
         
         try:
-            return json.dumps(_convert_to_native(result), indent=2, default=str)
+            return json.dumps(result, indent=2, default=str)
         except Exception as e:
             import traceback
             print(f"\nCRITICAL JSON DUMP ERROR in create_documents: {e}")
@@ -151,6 +143,39 @@ class AdvancedDocumentPlugin:
                 "errors": [f"Serialization Error: {e}"]
             })
     
+    async def create_documents_obj(
+        self,
+        excel_path: str,
+        template_docx: str,
+        output_folder: str,
+    ) -> Dict[str, Any]:
+        """
+        Run the full pipeline and return the result as a dict.
+        
+        Same as ``create_documents`` without the JSON encoding, for Python
+        callers such as AIDocumentOrchestrator.
+        
+        Args:
+            excel_path: Path to input Excel file
+            template_docx: Path to Word template
+            output_folder: Base output folder
+            
+        Returns:
+            Processing result dictionary with native Python types
+        """
+        document_config = {
+            "excel_path": excel_path,
+            "template_docx": template_docx,
+            "output_group_folder": f"{output_folder}/groups",
+            "output_notice_folder": f"{output_folder}/notices",
+            "merged_output_folder": f"{output_folder}/merged",
+        }
+        
+        result = await self.orchestrator.process_document_request(document_config)
+        self._last_result = result
+        
+        return _convert_to_native(result)
+    
     @kernel_function(
         name="validate_data",
         description="Validate input Excel data and template before processing. Returns JSON with validation result, errors, and warnings."
@@ -176,6 +201,26 @@ class AdvancedDocumentPlugin:
         Returns:
             JSON string with validation results
         """
+        return json.dumps(await self.validate_data_obj(excel_path, template_docx), indent=2)
+    
+    async def validate_data_obj(
+        self,
+        excel_path: str,
+        template_docx: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Validate input data and return the result as a dict.
+        
+        The validator caches its results per (path, mtime, size), so repeated
+        validate/create calls on unchanged files skip re-reading them.
+        
+        Args:
+            excel_path: Path to Excel file
+            template_docx: Optional template path
+            
+        Returns:
+            Validation result dictionary with native Python types
+        """
         task = DocumentTask(
             task_id="validation_check",
             document_type=DocumentType.OPEN_NEG_GROUP,
@@ -186,15 +231,19 @@ class AdvancedDocumentPlugin:
         )
         
         result_task = await self.validator.execute(task)
-        validation_result = result_task.metadata.get("validation_result", {})
+        validation_result = result_task.metadata.validation_result or {}
         
-        return json.dumps(_convert_to_native({
+        return _convert_to_native({
             "is_valid": validation_result.get("is_valid", False),
             "errors": validation_result.get("errors", []),
             "warnings": validation_result.get("warnings", []),
             "total_records": validation_result.get("total_records", 0),
             "validated_records": validation_result.get("validated_records", 0),
-        }), indent=2)
+        })
+    
+    def invalidate_cache(self) -> None:
+        """Drop the validator's cached results so the next validate_data re-reads the files."""
+        self.validator.invalidate_cache()
 
     
     @kernel_function(
@@ -241,15 +290,30 @@ class AdvancedDocumentPlugin:
         Returns:
             JSON string with analysis results
         """
+        analysis = await self.analyze_data_obj(excel_path)
+        if "error" in analysis:
+            return json.dumps(analysis)
+        return json.dumps(analysis, indent=2, default=str)
+    
+    async def analyze_data_obj(self, excel_path: str) -> Dict[str, Any]:
+        """
+        Analyze input data and return the result as a dict.
+        
+        Args:
+            excel_path: Path to Excel file
+            
+        Returns:
+            Analysis dictionary with native Python types, or {"error": ...}
+        """
         import os
-        import pandas as pd
         
         if not os.path.exists(excel_path):
-            return json.dumps({"error": f"File not found: {excel_path}"})
+            return {"error": f"File not found: {excel_path}"}
         
         try:
-            df = pd.read_excel(excel_path)
-            df.columns = df.columns.str.strip()
+            # Shared parse cache (columns already stripped); repeat analyses of an
+            # unchanged file skip the read
+            df = load_excel_cached(excel_path, all_columns=True)
             
             analysis = {
                 "total_rows": len(df),
@@ -284,10 +348,10 @@ class AdvancedDocumentPlugin:
             total_files = analysis.get("group_files_to_generate", 0) + analysis.get("notice_files_to_generate", 0)
             analysis["estimated_processing_seconds"] = total_files * 0.5  # Rough estimate
             
-            return json.dumps(_convert_to_native(analysis), indent=2, default=str)
+            return _convert_to_native(analysis)
             
         except Exception as e:
-            return json.dumps({"error": str(e)})
+            return {"error": str(e)}
 
 
 # Legacy compatibility wrapper
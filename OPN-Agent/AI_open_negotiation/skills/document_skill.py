@@ -1,6 +1,21 @@
+import io
+import os
 from semantic_kernel.functions import kernel_function
 from AI_open_negotiation.utils.logger import log_info, log_error
 
+
+def _render_notice(job, template_bytes):
+    """Fill the template for one notice and save it as .docx."""
+    from docx import Document
+    from AI_open_negotiation.agents.document_agent.io_utils import fill_placeholders
+
+    replacements, save_path, docx_path = job
+    doc = Document(io.BytesIO(template_bytes))
+    fill_placeholders(doc, replacements)
+    os.makedirs(save_path, exist_ok=True)
+    doc.save(docx_path)
+
+
 class DocumentSkill:
 
     @kernel_function(
@@ -10,49 +25,22 @@ class DocumentSkill:
     def create_documents(self, document_config: dict) -> dict:
         log_info("[DocumentSkill] Document creation started")
         try:
-            import os
             import shutil
+            from concurrent.futures import ThreadPoolExecutor
+            from functools import partial
             import pandas as pd
-            from docx import Document
-            from docx2pdf import convert
             import pythoncom
+            from AI_open_negotiation.agents.document_agent.io_utils import (
+                convert_to_pdf_batch,
+                frame_to_rows,
+                load_excel_cached,
+                load_template_bytes,
+                run_jobs,
+                write_xlsx_rows,
+            )
+            from AI_open_negotiation.utils.formatters import format_currency_series
 
             # ================= HELPER FUNCTIONS =================
-            def add_dollar_sign(x):
-                if pd.isna(x) or str(x).strip().upper() == 'N/A':
-                    return 'N/A'
-                try:
-                    value = float(str(x).replace('$', '').replace(',', '').strip())
-                    return f"${value:,.2f}"
-                except Exception:
-                    return str(x)
-
-            def replace_placeholders(paragraph, replacements, bold_keys):
-                full_text = "".join(run.text for run in paragraph.runs)
-                replaced = False
-                for placeholder, replacement in replacements.items():
-                    if placeholder in full_text:
-                        full_text = full_text.replace(placeholder, replacement)
-                        replaced = True
-                if replaced:
-                    for run in paragraph.runs:
-                        run.text = ""
-                    i = 0
-                    while i < len(full_text):
-                        match_found = False
-                        for placeholder, replacement in replacements.items():
-                            rep_len = len(replacement)
-                            if full_text[i:i + rep_len] == replacement:
-                                run = paragraph.add_run(replacement)
-                                if placeholder in bold_keys:
-                                    run.bold = True
-                                i += rep_len
-                                match_found = True
-                                break
-                        if not match_found:
-                            paragraph.add_run(full_text[i])
-                            i += 1
-
             def is_allowed_file(filename):
                 return os.path.splitext(filename)[1].lower() in {".xls", ".xlsx", ".doc", ".docx", ".pdf"}
 
@@ -77,11 +65,8 @@ class DocumentSkill:
                                 safe_copy(os.path.join(root, file), dest_subfolder)
 
             # ================= OPEN NEG GROUP =================
-            def generate_open_neg_group(input_excel_path, output_group_folder):
-                df = pd.read_excel(input_excel_path)
-                df.columns = df.columns.str.strip()
+            def generate_open_neg_group(df, output_group_folder):
                 os.makedirs(output_group_folder, exist_ok=True)
-                unique_combinations = df[['ProvOrgNPI', 'Provider', 'InsurancePlanName']].drop_duplicates()
                 selected_columns = {
                     'CPT_Description': 'Description of item(s) and/or service(s)',
                     'Claim Number': 'Claim Number',
@@ -91,68 +76,90 @@ class DocumentSkill:
                     'Initial Payment': 'Initial payment (if no initial payment amount, write N/A)',
                     'Offer': 'Offer for total out-of- network rate (including any cost sharing)'
                 }
-                for _, row in unique_combinations.iterrows():
-                    filtered_df = df[
-                        (df['ProvOrgNPI'] == row['ProvOrgNPI']) &
-                        (df['Provider'] == row['Provider']) &
-                        (df['InsurancePlanName'] == row['InsurancePlanName'])
-                    ]
-                    if filtered_df.empty or pd.isna(filtered_df.iloc[0].get('OpenNegGroup')):
+                # Rename and format the output columns once for the whole sheet;
+                # each group then just slices its rows
+                output_all = df[list(selected_columns.keys())].rename(columns=selected_columns)
+                output_all['Date provided'] = pd.to_datetime(output_all['Date provided'], errors='coerce').dt.strftime('%b %d, %Y')
+                output_all['Initial payment (if no initial payment amount, write N/A)'] = format_currency_series(output_all['Initial payment (if no initial payment amount, write N/A)'])
+                output_all['Offer for total out-of- network rate (including any cost sharing)'] = format_currency_series(output_all['Offer for total out-of- network rate (including any cost sharing)'])
+
+                writes = []
+                # One hash pass over the keys (first-seen order, NaN keys dropped)
+                groups = df.groupby(['ProvOrgNPI', 'Provider', 'InsurancePlanName'], sort=False).indices
+                for (npi, _, insurance_plan), positions in groups.items():
+                    group_name = df['OpenNegGroup'].iat[positions[0]]
+                    if pd.isna(group_name):
                         continue
-                    output_df = filtered_df[list(selected_columns.keys())].rename(columns=selected_columns)
-                    output_df['Date provided'] = pd.to_datetime(output_df['Date provided'], errors='coerce').dt.strftime('%b %d, %Y')
+                    output_df = output_all.take(positions)
                     output_df.insert(0, 'SNO', range(1, len(output_df) + 1))
-                    output_df['Initial payment (if no initial payment amount, write N/A)'] = output_df['Initial payment (if no initial payment amount, write N/A)'].apply(add_dollar_sign)
-                    output_df['Offer for total out-of- network rate (including any cost sharing)'] = output_df['Offer for total out-of- network rate (including any cost sharing)'].apply(add_dollar_sign)
-                    safe_npi = "".join(c if c.isalnum() else "_" for c in str(row['ProvOrgNPI']))
-                    insurance = str(row['InsurancePlanName']).strip()
+                    safe_npi = "".join(c if c.isalnum() else "_" for c in str(npi))
+                    insurance = str(insurance_plan).strip()
                     output_path = os.path.join(output_group_folder, safe_npi, insurance)
                     os.makedirs(output_path, exist_ok=True)
-                    group_filename = str(filtered_df.iloc[0]['OpenNegGroup']).strip()
+                    group_filename = str(group_name).strip()
                     if not group_filename.lower().endswith('.xlsx'):
                         group_filename += '.xlsx'
-                    output_df.to_excel(os.path.join(output_path, group_filename), index=False)
+                    header, rows = frame_to_rows(output_df)
+                    writes.append((os.path.join(output_path, group_filename), header, rows))
+
+                # Group files are independent; write them concurrently as plain
+                # values (xlsxwriter constant_memory, not to_excel via openpyxl)
+                run_jobs(lambda w: write_xlsx_rows(*w), writes)
 
             # ================= OPEN NEG NOTICE =================
-            def generate_open_neg_notice(input_excel_path, template_docx_path, output_notice_folder):
-                df = pd.read_excel(input_excel_path, engine='openpyxl')
-                df.columns = df.columns.str.strip()
+            def generate_open_neg_notice(df, template_docx_path, output_notice_folder):
                 df = df.drop_duplicates(subset=['ProvOrgNPI', 'Hospital Name', 'OpenNegNotice', 'InsurancePlanName'])
                 os.makedirs(output_notice_folder, exist_ok=True)
-                for _, row in df.iterrows():
-                    if pd.isna(row.get('OpenNegNotice')):
-                        continue
-                    doc = Document(template_docx_path)
+                jobs = []
+                pdf_pairs = []
+                # Plain tuples over just the needed columns (no Series per row);
+                # rows without a notice name are dropped up front
+                notice_columns = ['Hospital Name', 'Provider', 'InsurancePlanName', 'Notice Date',
+                                  'CMS Date1', 'CMS Date2', 'ProvOrgNPI', 'OpenNegNotice']
+                rows = df.loc[df['OpenNegNotice'].notna(), notice_columns].itertuples(index=False, name=None)
+                for hospital, provider, insurance_plan, notice_date, cms_date1, cms_date2, npi, notice in rows:
                     replacements = {
-                        '{Hospital Name}': str(row['Hospital Name']),
-                        '{Provider}': str(row['Provider']),
-                        '{InsurancePlanName}': str(row['InsurancePlanName']),
-                        '{Notice Date}': str(row['Notice Date']),
-                        '{CMS Date1}': str(row['CMS Date1']),
-                        '{CMS Date2}': str(row['CMS Date2'])
+                        '{Hospital Name}': str(hospital),
+                        '{Provider}': str(provider),
+                        '{InsurancePlanName}': str(insurance_plan),
+                        '{Notice Date}': str(notice_date),
+                        '{CMS Date1}': str(cms_date1),
+                        '{CMS Date2}': str(cms_date2)
                     }
-                    bold_keys = replacements.keys()
-                    for paragraph in doc.paragraphs:
-                        replace_placeholders(paragraph, replacements, bold_keys)
-                    for table in doc.tables:
-                        for row_cells in table.rows:
-                            for cell in row_cells.cells:
-                                for paragraph in cell.paragraphs:
-                                    replace_placeholders(paragraph, replacements, bold_keys)
-                    save_path = os.path.join(output_notice_folder, str(row['ProvOrgNPI']), str(row['InsurancePlanName']))
-                    os.makedirs(save_path, exist_ok=True)
-                    notice_filename = str(row['OpenNegNotice']).strip()
+                    save_path = os.path.join(output_notice_folder, str(npi), str(insurance_plan))
+                    notice_filename = str(notice).strip()
                     base_filename = os.path.splitext(notice_filename)[0]
                     docx_path = os.path.join(save_path, base_filename + ".docx")
                     pdf_path = os.path.join(save_path, base_filename + ".pdf")
-                    doc.save(docx_path)
-                    convert(docx_path, pdf_path)
+                    jobs.append((replacements, save_path, docx_path))
+                    pdf_pairs.append((docx_path, pdf_path))
+                if not jobs:
+                    return
+
+                # Notices are independent: render them on a thread pool, all
+                # parsing the same in-memory template
+                run_jobs(partial(_render_notice, template_bytes=load_template_bytes(template_docx_path)), jobs)
+
+                # Convert all notices in one Word session (staged in a temp folder)
+                # instead of launching Word per file; "pdf_backend" in the config
+                # selects "soffice" (headless LibreOffice) or "reportlab" instead
+                _, pdf_error = convert_to_pdf_batch(pdf_pairs, document_config.get("pdf_backend", "word"))
+                if pdf_error:
+                    raise RuntimeError(f"PDF conversion failed: {pdf_error}")
 
             # ================= PIPELINE =================
+            # Read the workbook once (cached by path/mtime, columns stripped) for both generators
+            df = load_excel_cached(document_config["excel_path"])
+
             pythoncom.CoInitialize()
             try:
-                generate_open_neg_group(document_config["excel_path"], document_config["output_group_folder"])
-                generate_open_neg_notice(document_config["excel_path"], document_config["template_docx"], document_config["output_notice_folder"])
+                # Group files and notices are independent; build them side by side
+                # (Word conversion initializes COM on its own thread)
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    group_run = pool.submit(generate_open_neg_group, df.copy(deep=False), document_config["output_group_folder"])
+                    notice_run = pool.submit(generate_open_neg_notice, df.copy(deep=False), document_config["template_docx"], document_config["output_notice_folder"])
+                    group_run.result()
+                    notice_run.result()
                 merge_folders(document_config["output_group_folder"], document_config["output_notice_folder"], document_config["merged_output_folder"])
             finally:
                 pythoncom.CoUninitialize()
@@ -14,6 +14,7 @@ from .file_utils import (
 )
 from .formatters import (
     format_currency,
+    format_currency_series,
     format_date,
     format_npi,
     format_percentage,
@@ -38,6 +39,7 @@ __all__ = [
     "list_files_by_extension",
     # Formatters
     "format_currency",
+    "format_currency_series",
     "format_date",
     "format_npi",
     "format_percentage",
@@ -7,6 +7,7 @@ Provides formatting utilities for currency, dates, and other data types.
 from datetime import datetime
 from typing import Any, Optional, Union
 
+import numpy as np
 import pandas as pd
 
 
@@ -51,6 +52,52 @@ def format_currency(value: Any, default: str = "N/A") -> str:
         return value_str
 
 
+def format_currency_series(values: pd.Series) -> pd.Series:
+    """
+    Vectorized ``format_currency`` for a whole column.
+    
+    Missing and 'N/A' cells become 'N/A', numeric cells become '$1,234.50',
+    and anything else is passed through as its string form.
+    
+    Args:
+        values: Column of amounts (numbers or strings with $ and commas)
+        
+    Returns:
+        Series of formatted strings with the same index
+        
+    Example:
+        >>> format_currency_series(pd.Series([1234.5, "$1,000", None]))
+        0    $1,234.50
+        1    $1,000.00
+        2          N/A
+        dtype: object
+    """
+    text = values.astype("string").str.strip()
+    cleaned = pd.to_numeric(text.str.replace(r"[$,]", "", regex=True), errors="coerce")
+    
+    # Amounts repeat heavily, so format each distinct value once and
+    # broadcast with take(); the trailing None covers NaN codes (-1)
+    codes, uniques = pd.factorize(cleaned)
+    labels = np.array(["${:,.2f}".format(v) for v in uniques.tolist()] + [None], dtype=object)
+    formatted = pd.Series(labels.take(codes), index=cleaned.index)
+    missing = values.isna() | text.str.upper().eq("N/A").fillna(False)
+    
+    # Cells to_numeric rejects are usually plain text, but float() still
+    # accepts a few spellings (e.g. 'nan'), so retry just those one by one
+    unparsed = cleaned.isna() & ~missing
+    if unparsed.any():
+        formatted[unparsed] = values[unparsed].map(_format_unparsed)
+    return formatted.where(~missing, "N/A")
+
+
+def _format_unparsed(value: Any) -> str:
+    """Scalar fallback for format_currency_series cells to_numeric rejected."""
+    try:
+        return f"${float(str(value).replace('$', '').replace(',', '').strip()):,.2f}"
+    except (ValueError, TypeError):
+        return str(value)
+
+
 def format_date(
     value: Any,
     output_format: str = "%b %d, %Y",
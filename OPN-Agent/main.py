@@ -20,7 +20,7 @@ import pandas as pd
 from typing import Any, Dict, Optional
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 
 from kernel_config import create_kernel, get_config, SystemConfig
@@ -233,9 +233,15 @@ async def run_advanced_workflow(request: DocumentRequest):
                 user_instructions=request.user_instructions
             )
         else:
-            # Use standard orchestrator
+            # Use standard orchestrator; its result holds only native types,
+            # so serialize it directly instead of walking it again
             orchestrator = OrchestratorAgent(config.to_dict())
-            result = await orchestrator.process_document_request(document_config)
+            processing_result = await orchestrator.run_pipeline(document_config)
+            print(f"✔ Advanced Workflow COMPLETED | Status: {processing_result.status}")
+            return Response(
+                content=processing_result.to_json_bytes({"request_id": request.request_id}),
+                media_type="application/json"
+            )
         
         print(f"✔ Advanced Workflow COMPLETED | Status: {result.get('status')}")
         
@@ -275,12 +281,11 @@ async def analyze_data(request: DocumentRequest):
     Analyze input data and provide insights.
     """
     plugin = AdvancedDocumentPlugin()
-    result = await plugin.analyze_data(excel_path=request.excel_path)
+    result = await plugin.analyze_data_obj(excel_path=request.excel_path)
     
-    import json
     return {
         "request_id": request.request_id,
-        "analysis": json.loads(result)
+        "analysis": result
     }
 
 
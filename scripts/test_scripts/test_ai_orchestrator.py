@@ -0,0 +1,45 @@
+"""
+Tests for AIDocumentOrchestrator's interactive input.
+
+Run with: pytest scripts/test_scripts/test_ai_orchestrator.py
+"""
+
+import asyncio
+import builtins
+import os
+import sys
+import threading
+
+import pytest
+
+# Add OPN-Agent to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../OPN-Agent"))
+
+pytest.importorskip("semantic_kernel")
+
+from AI_open_negotiation.orchestrators.ai_orchestrator import AIDocumentOrchestrator
+
+
+def test_read_input_runs_off_the_event_loop(monkeypatch):
+    """input() runs on a worker thread while the loop keeps serving other tasks."""
+    release = threading.Event()
+    seen = {}
+    
+    def fake_input(prompt=""):
+        seen["prompt"] = prompt
+        seen["thread"] = threading.current_thread()
+        release.wait(5)
+        return " analyze data.xlsx "
+    
+    monkeypatch.setattr(builtins, "input", fake_input)
+    
+    async def main():
+        read = asyncio.create_task(AIDocumentOrchestrator._read_input("You: "))
+        await asyncio.sleep(0.01)  # The loop is still free while input() blocks
+        assert not read.done()
+        release.set()
+        return await read
+    
+    assert asyncio.run(main()) == " analyze data.xlsx "
+    assert seen["prompt"] == "You: "
+    assert seen["thread"] is not threading.main_thread()
@@ -0,0 +1,44 @@
+"""
+Tests for BaseAgent config parsing.
+
+Run with: pytest scripts/test_scripts/test_base_agent.py
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add OPN-Agent to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../OPN-Agent"))
+
+from AI_open_negotiation.agents.document_agent.base_agent import BaseAgent
+
+
+class _Agent(BaseAgent):
+    async def execute(self, task):
+        return task
+
+
+def test_configs_without_custom_settings_are_shared_and_read_only():
+    first = _Agent("a").config
+    assert _Agent("b", {}).config is first
+    with pytest.raises(TypeError):
+        first.custom_settings["leak"] = True
+    assert "leak" not in _Agent("c").config.custom_settings
+
+
+def test_empty_custom_settings_gets_a_private_config():
+    shared = _Agent("a").config
+    config = _Agent("b", {"custom_settings": {}}).config
+    assert config is not shared
+    assert dict(config.custom_settings) == {}
+
+
+def test_custom_settings_are_copied_from_the_caller():
+    settings = {"deep_validation": True}
+    config = _Agent("a", {"custom_settings": settings}).config
+    settings["deep_validation"] = False
+    assert config.custom_settings.get("deep_validation") is True
+    with pytest.raises(TypeError):
+        config.custom_settings["deep_validation"] = False
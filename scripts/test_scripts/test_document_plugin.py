@@ -0,0 +1,48 @@
+"""
+Tests for AdvancedDocumentPlugin validation caching.
+
+Run with: pytest scripts/test_scripts/test_document_plugin.py
+"""
+
+import asyncio
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Add OPN-Agent to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../OPN-Agent"))
+
+pytest.importorskip("semantic_kernel")
+
+from AI_open_negotiation.agents.document_agent.validation_agent import ValidationAgent
+from AI_open_negotiation.plugins.document_plugin import AdvancedDocumentPlugin
+
+
+def test_validate_data_obj_uses_the_validator_cache(tmp_path, monkeypatch):
+    """Repeat validations of an unchanged file parse it once; invalidate_cache() forces a re-read."""
+    excel_path = tmp_path / "input.xlsx"
+    pd.DataFrame({column: ["x"] for column in ValidationAgent.REQUIRED_COLUMNS_GROUP}).to_excel(
+        excel_path, index=False
+    )
+    plugin = AdvancedDocumentPlugin()
+    
+    calls = []
+    real_validate = plugin.validator._validate_excel_sync
+    
+    def validate(*args):
+        calls.append(args[0])
+        return real_validate(*args)
+    
+    monkeypatch.setattr(plugin.validator, "_validate_excel_sync", validate)
+    
+    first = asyncio.run(plugin.validate_data_obj(str(excel_path)))
+    second = asyncio.run(plugin.validate_data_obj(str(excel_path)))
+    assert first == second
+    assert first["total_records"] == 1
+    assert len(calls) == 1
+    
+    plugin.invalidate_cache()
+    asyncio.run(plugin.validate_data_obj(str(excel_path)))
+    assert len(calls) == 2
@@ -0,0 +1,43 @@
+"""
+Tests for the currency formatters.
+
+Run with: pytest scripts/test_scripts/test_formatters.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add OPN-Agent to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../OPN-Agent"))
+
+from AI_open_negotiation.agents.document_agent.generation_agents import GroupGenerationAgent
+from AI_open_negotiation.utils.formatters import format_currency, format_currency_series
+
+VALUES = [
+    1234.5, 0, -5, 7, 1e6, 0.005, np.int64(42), np.float64(3.14159),
+    "1234.5", "$1,234.56", "1,000", " 12 ", "-$3", "$ 5", "1e3",
+    None, np.nan, pd.NA, "N/A", " n/a ", "",
+    "abc", "  spaced text  ", "12abc", "$", "nan", "inf", True,
+]
+
+
+@pytest.mark.parametrize("value", VALUES, ids=repr)
+def test_series_matches_group_agent_formatter(value):
+    expected = GroupGenerationAgent._format_currency(value)
+    assert format_currency_series(pd.Series([value], dtype=object)).iloc[0] == expected
+
+
+def test_mixed_column_matches_elementwise():
+    values = pd.Series(VALUES * 3, dtype=object, index=range(100, 100 + len(VALUES) * 3))
+    result = format_currency_series(values)
+    assert result.index.equals(values.index)
+    assert result.tolist() == [GroupGenerationAgent._format_currency(v) for v in values]
+
+
+def test_numeric_column_matches_scalar_formatter():
+    values = pd.Series([1234.5, None, 0.0, -12.345, 1234.5])
+    assert format_currency_series(values).tolist() == [format_currency(v) for v in values]
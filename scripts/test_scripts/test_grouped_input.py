@@ -0,0 +1,57 @@
+"""
+Tests for GroupedInput.
+
+Run with: pytest scripts/test_scripts/test_grouped_input.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add OPN-Agent to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../OPN-Agent"))
+
+from AI_open_negotiation.agents.document_agent.grouped_input import DATE_COLUMN, GroupedInput
+
+
+def _frame():
+    return pd.DataFrame({
+        "ProvOrgNPI": [456, 123, 456, np.nan, 123, np.nan],
+        "Provider": ["B", "A", "B", "C", "A", "C"],
+        "InsurancePlanName": ["P2", "P1", "P2", "P3", "P1", "P3"],
+        "Hospital Name": ["H2", "H1", "H2", "H3", "H1", "H3"],
+        "OpenNegNotice": ["N2", "N1", "N2", "N3", "N9", "N3"],
+        DATE_COLUMN: ["2024-01-05", "2024-02-10", "bad", None, "2024-03-01", "2024-03-02"],
+    }, index=[10, 11, 12, 13, 14, 15])
+
+
+def test_group_index_keeps_nan_keys_in_first_seen_order():
+    grouped = GroupedInput.from_frame(_frame())
+    keys = list(grouped.group_index)
+    assert keys[:2] == [(456.0, "B", "P2"), (123.0, "A", "P1")]
+    assert pd.isna(keys[2][0]) and keys[2][1:] == ("C", "P3")
+    assert [list(rows) for rows in grouped.group_index.values()] == [[0, 2], [1, 4], [3, 5]]
+
+
+def test_notice_unique_index_keeps_first_row_per_notice():
+    grouped = GroupedInput.from_frame(_frame())
+    assert list(grouped.notice_unique_index) == [10, 11, 13, 14]
+
+
+def test_from_frame_adds_prepared_columns_without_touching_source():
+    source = _frame()
+    grouped = GroupedInput.from_frame(source)
+    assert "_date_fmt" not in source.columns
+    assert grouped.df["_date_fmt"].iloc[0] == "Jan 05, 2024"
+    assert grouped.df["_date_fmt"].iloc[2:4].isna().all()
+    assert grouped.df["_safe_npi"].iloc[0] == "456_0"
+
+
+def test_group_only_sheet_prepares_without_notice_or_date_columns():
+    df = _frame().drop(columns=["Hospital Name", "OpenNegNotice", DATE_COLUMN])
+    grouped = GroupedInput.from_frame(df).prepare()
+    assert "_date_fmt" not in grouped.df.columns
+    assert len(grouped.group_index) == 3
+    assert "notice_unique_index" not in grouped.__dict__
@@ -0,0 +1,160 @@
+"""
+Tests for the shared generator I/O helpers (io_utils).
+
+Run with: pytest scripts/test_scripts/test_io_utils.py
+"""
+
+import os
+import stat
+import sys
+import threading
+from urllib.parse import urlparse
+
+import pandas as pd
+import pytest
+
+# Add OPN-Agent to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../OPN-Agent"))
+
+from AI_open_negotiation.agents.document_agent import io_utils
+
+
+@pytest.fixture
+def read_calls(monkeypatch):
+    """Empty the workbook cache and record every real parse as (path, all_columns)."""
+    calls = []
+    real_read = io_utils._read_excel
+    
+    def counting_read(path, all_columns):
+        calls.append((path, all_columns))
+        return real_read(path, all_columns)
+    
+    monkeypatch.setattr(io_utils, "_read_excel", counting_read)
+    monkeypatch.setattr(io_utils, "_EXCEL_CACHE", io_utils.OrderedDict())
+    return calls
+
+
+def _write_sheet(path, rows):
+    pd.DataFrame({
+        " ProvOrgNPI ": list(range(rows)),
+        "Provider": ["p"] * rows,
+        "Unused": ["u"] * rows,
+    }).to_excel(path, index=False)
+
+
+def test_load_excel_cached_parses_generation_columns_once(tmp_path, read_calls):
+    """Repeat loads hit the cache; the generation subset skips unused columns."""
+    path = tmp_path / "input.xlsx"
+    _write_sheet(path, 2)
+    
+    first = io_utils.load_excel_cached(str(path))
+    second = io_utils.load_excel_cached(str(path))
+    
+    assert list(first.columns) == ["ProvOrgNPI", "Provider"]
+    assert second.equals(first)
+    assert len(read_calls) == 1
+
+
+def test_load_excel_cached_full_parse_serves_subset(tmp_path, read_calls):
+    """After a full-column load (analysis), generation reuses it instead of re-reading."""
+    path = tmp_path / "input.xlsx"
+    _write_sheet(path, 2)
+    
+    full = io_utils.load_excel_cached(str(path), all_columns=True)
+    subset = io_utils.load_excel_cached(str(path))
+    
+    assert list(full.columns) == ["ProvOrgNPI", "Provider", "Unused"]
+    assert list(subset.columns) == ["ProvOrgNPI", "Provider"]
+    assert read_calls == [(str(path), True)]
+
+
+def test_load_excel_cached_rereads_changed_file(tmp_path, read_calls):
+    """Editing the workbook (new size/mtime) invalidates the cached parse."""
+    path = tmp_path / "input.xlsx"
+    _write_sheet(path, 2)
+    assert len(io_utils.load_excel_cached(str(path))) == 2
+    
+    _write_sheet(path, 5)
+    stat_result = os.stat(path)
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+    
+    assert len(io_utils.load_excel_cached(str(path))) == 5
+    assert len(read_calls) == 2
+
+
+FAKE_SOFFICE = """#!/bin/sh
+# Writes a stub PDF per .docx argument into --outdir and logs its arguments
+out=""; prev=""
+for a in "$@"; do [ "$prev" = "--outdir" ] && out="$a"; prev="$a"; done
+for a in "$@"; do
+    case "$a" in *.docx) echo pdf > "$out/$(basename "$a" .docx).pdf";; esac
+done
+echo "$@" >> "{log}"
+"""
+
+
+@pytest.mark.skipif(os.name == "nt", reason="fake soffice is a POSIX shell script")
+def test_convert_to_pdf_batch_soffice_shards(tmp_path, monkeypatch):
+    """The LibreOffice backend converts every document, one isolated profile per shard."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    log = tmp_path / "soffice.log"
+    soffice = bin_dir / "soffice"
+    soffice.write_text(FAKE_SOFFICE.replace("{log}", str(log)))
+    soffice.chmod(soffice.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(io_utils.os, "cpu_count", lambda: 4)
+    
+    pairs = []
+    for i in range(3 * io_utils._SOFFICE_MIN_SHARD):
+        docx = tmp_path / f"n{i}.docx"
+        docx.write_text("docx")
+        pairs.append((str(docx), str(tmp_path / f"n{i}.pdf")))
+    
+    converted, error = io_utils.convert_to_pdf_batch(pairs, backend="soffice")
+    
+    assert error is None
+    assert converted == {pdf for _, pdf in pairs}
+    assert all(os.path.exists(pdf) for pdf in converted)
+    
+    runs = log.read_text().splitlines()
+    assert len(runs) == 3
+    profiles = {run.split()[0] for run in runs}
+    assert len(profiles) == 3
+    for profile in profiles:
+        option, _, uri = profile.partition("=")
+        assert option == "-env:UserInstallation"
+        parsed = urlparse(uri)
+        assert parsed.scheme == "file" and parsed.netloc == ""
+
+
+def test_convert_to_pdf_batch_soffice_missing(tmp_path, monkeypatch):
+    """Without LibreOffice on PATH the soffice backend reports an error."""
+    monkeypatch.setattr("shutil.which", lambda name: None)
+    docx = tmp_path / "a.docx"
+    docx.write_text("docx")
+    
+    converted, error = io_utils.convert_to_pdf_batch([(str(docx), str(tmp_path / "a.pdf"))], backend="soffice")
+    
+    assert converted == set()
+    assert error == "LibreOffice not found"
+
+
+def test_run_jobs_inline_below_threshold():
+    """Small batches run on the calling thread, in order."""
+    caller = threading.get_ident()
+    results = io_utils.run_jobs(lambda job: (job, threading.get_ident()), range(io_utils.PARALLEL_MIN_JOBS - 1))
+    
+    assert [job for job, _ in results] == list(range(io_utils.PARALLEL_MIN_JOBS - 1))
+    assert {thread for _, thread in results} == {caller}
+
+
+def test_run_jobs_uses_threads_and_keeps_order():
+    """Larger batches fan out to worker threads; results stay in job order."""
+    caller = threading.get_ident()
+    jobs = list(range(4 * io_utils.PARALLEL_MIN_JOBS))
+    results = io_utils.run_jobs(lambda job: (job, threading.get_ident()), jobs, max_workers=4)
+    
+    assert [job for job, _ in results] == jobs
+    assert caller not in {thread for _, thread in results}
+    assert io_utils.run_jobs(lambda job: threading.get_ident(), jobs, max_workers=1) == [caller] * len(jobs)
@@ -0,0 +1,108 @@
+"""
+Tests for ValidationAgent.
+
+Run with: pytest scripts/test_scripts/test_validation_agent.py
+"""
+
+import asyncio
+import os
+import sys
+
+import pandas as pd
+
+# Add OPN-Agent to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../OPN-Agent"))
+
+from AI_open_negotiation.agents.document_agent import validation_agent
+from AI_open_negotiation.agents.document_agent.validation_agent import ValidationAgent
+from AI_open_negotiation.models.task_models import DocumentTask, DocumentType, TaskStatus
+
+
+def _write_input(path, rows=1):
+    """Write a minimal input workbook with every required group column."""
+    data = {column: ["x"] * rows for column in ValidationAgent.REQUIRED_COLUMNS_GROUP}
+    data["ProvOrgNPI"] = list(range(1, rows + 1))
+    pd.DataFrame(data).to_excel(path, index=False)
+
+
+def _run(agent, input_data):
+    task = DocumentTask(
+        task_id="validation_test",
+        document_type=DocumentType.OPEN_NEG_GROUP,
+        input_data=input_data,
+    )
+    return asyncio.run(agent.execute(task))
+
+
+def test_unreadable_output_folder_is_reported_per_check(tmp_path, monkeypatch):
+    """A folder that can't be listed becomes an error for that folder; the other checks still run."""
+    excel_path = tmp_path / "input.xlsx"
+    _write_input(excel_path)
+    locked = tmp_path / "locked"
+    locked.mkdir()
+    
+    real_scandir = os.scandir
+    
+    def scandir(path="."):
+        if os.path.abspath(path) == str(locked):
+            raise PermissionError(13, "Permission denied", str(path))
+        return real_scandir(path)
+    
+    monkeypatch.setattr(validation_agent.os, "scandir", scandir)
+    
+    task = _run(ValidationAgent("V", {}), {
+        "excel_path": str(excel_path),
+        "output_group_folder": str(locked),
+        "output_notice_folder": str(tmp_path / "notices"),
+    })
+    result = task.metadata.validation_result
+    
+    assert task.status == TaskStatus.FAILED
+    assert result is not None
+    assert result["is_valid"] is False
+    assert len(result["errors"]) == 1
+    assert result["errors"][0].startswith("output_group_folder check failed:")
+    # The Excel check still completed and reported its counts
+    assert result["total_records"] == 1
+
+
+def test_missing_excel_file_is_a_validation_error(tmp_path):
+    """A missing input file fails validation with an error instead of raising."""
+    task = _run(ValidationAgent("V", {}), {"excel_path": str(tmp_path / "missing.xlsx")})
+    result = task.metadata.validation_result
+    
+    assert task.status == TaskStatus.FAILED
+    assert result["is_valid"] is False
+    assert result["errors"]
+
+
+def test_excel_result_cache_follows_file_changes(tmp_path, monkeypatch):
+    """An unchanged file reuses its result; an edited file or invalidate_cache() re-validates."""
+    excel_path = tmp_path / "input.xlsx"
+    _write_input(excel_path, rows=1)
+    agent = ValidationAgent("V", {})
+    
+    calls = []
+    real_validate = agent._validate_excel_sync
+    
+    def validate(*args):
+        calls.append(args[0])
+        return real_validate(*args)
+    
+    monkeypatch.setattr(agent, "_validate_excel_sync", validate)
+    
+    def total_records():
+        return _run(agent, {"excel_path": str(excel_path)}).metadata.validation_result["total_records"]
+    
+    assert total_records() == 1
+    assert total_records() == 1
+    assert len(calls) == 1
+    
+    _write_input(excel_path, rows=3)
+    os.utime(excel_path, ns=(0, 10**9))  # Ensure the mtime changes on coarse clocks
+    assert total_records() == 3
+    assert len(calls) == 2
+    
+    agent.invalidate_cache()
+    assert total_records() == 3
+    assert len(calls) == 3